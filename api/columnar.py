@@ -0,0 +1,233 @@
+# api/columnar.py
+"""
+Columnar (binary) payloads for bulk scoring on POST /predict/batch.
+
+Two wire formats are accepted, both carrying the seven RAW_FEATURES as columns:
+
+- Arrow IPC stream (`application/vnd.apache.arrow.stream`): one record batch
+  or more. `type` may be plain or dictionary-encoded strings.
+- MessagePack (`application/msgpack`): a map of column name → value, with
+  every column carried as raw little-endian buffers so nothing is decoded row
+  by row (see msgpack_payload for the client side):
+    step, amounts       int32 / float64 buffers (np.frombuffer)
+    type                {'codes': uint8 buffer, 'categories': [str, ...]}
+    nameOrig, nameDest  {'offsets': int32 buffer (n + 1), 'data': UTF-8 bytes}
+  The string columns are rebuilt as Arrow arrays, as in the Arrow path. Plain
+  arrays of str are still accepted for any string column, but they go through
+  one Python object per row (see benchmarks/bench_ingest.py, msgpack_list).
+
+Responses come back in the request's format with `fraud_probability` (float64)
+and `is_fraud` (bool / uint8 in MessagePack) columns.
+"""
+import numpy as np
+import pandas as pd
+from src.config import RAW_FEATURES, TX_TYPES
+
+ARROW_STREAM = 'application/vnd.apache.arrow.stream'
+MSGPACK      = 'application/msgpack'
+CONTENT_TYPES = (ARROW_STREAM, MSGPACK, 'application/x-msgpack')
+
+NUMERIC_DTYPES = {
+    'step':           np.dtype('<i4'),
+    'amount':         np.dtype('<f8'),
+    'oldbalanceOrg':  np.dtype('<f8'),
+    'oldbalanceDest': np.dtype('<f8'),
+}
+STRING_COLUMNS = ['type', 'nameOrig', 'nameDest']
+
+
+class ColumnarError(ValueError):
+    """Payload is malformed or fails validation — surfaced as HTTP 422."""
+
+
+def media_type(content_type: str | None) -> str:
+    """Normalise a Content-Type header; raises LookupError if unsupported."""
+    media = (content_type or '').split(';')[0].strip().lower()
+    if media not in CONTENT_TYPES:
+        raise LookupError(f'Unsupported content type {media!r}. Use one of {CONTENT_TYPES}.')
+    return ARROW_STREAM if media == ARROW_STREAM else MSGPACK
+
+
+# ── Decode ────────────────────────────────────────────────────────────────────
+
+def decode(body: bytes, content_type: str) -> pd.DataFrame:
+    """Decode a columnar payload into a RAW_FEATURES frame (not yet validated)."""
+    import pyarrow as pa
+
+    try:
+        if media_type(content_type) == ARROW_STREAM:
+            return _decode_arrow(body)
+        return _decode_msgpack(body)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+        # e.g. a list<int64> nameOrig or non-string categories: bad input, not a server error
+        raise ColumnarError(f'Unsupported column contents: {e}') from e
+
+
+def _decode_arrow(body: bytes) -> pd.DataFrame:
+    import pyarrow as pa
+
+    try:
+        table = pa.ipc.open_stream(body).read_all()
+    except (pa.ArrowInvalid, OSError) as e:
+        raise ColumnarError(f'Invalid Arrow IPC stream: {e}') from e
+    _check_columns(table.column_names)
+
+    columns = {}
+    for name in RAW_FEATURES:
+        col = table.column(name)
+        if pa.types.is_dictionary(col.type):
+            col = col.cast(col.type.value_type)
+        if name in NUMERIC_DTYPES:
+            if col.null_count:
+                raise ColumnarError(f'Column {name!r} contains {col.null_count} nulls')
+            try:
+                col = col.cast(pa.from_numpy_dtype(NUMERIC_DTYPES[name]))
+            except pa.ArrowInvalid as e:
+                raise ColumnarError(f'Column {name!r}: {e}') from e
+            columns[name] = col.combine_chunks().to_numpy(zero_copy_only=False)
+        else:
+            # strings stay Arrow-backed: no per-row Python objects
+            columns[name] = pd.arrays.ArrowExtensionArray(col.cast(pa.string()))
+    return pd.DataFrame(columns, copy=False)
+
+
+def _decode_msgpack(body: bytes) -> pd.DataFrame:
+    import msgpack
+
+    try:
+        payload = msgpack.unpackb(body, raw=False)
+    except (ValueError, msgpack.UnpackException) as e:
+        raise ColumnarError(f'Invalid MessagePack payload: {e}') from e
+    if not isinstance(payload, dict):
+        raise ColumnarError('MessagePack payload must be a map of column name → values')
+    _check_columns(payload.keys())
+
+    columns = {}
+    for name, dtype in NUMERIC_DTYPES.items():
+        buf = payload[name]
+        if not isinstance(buf, bytes) or len(buf) % dtype.itemsize:
+            raise ColumnarError(f'Column {name!r} must be a raw {dtype.str} buffer')
+        columns[name] = np.frombuffer(buf, dtype=dtype)
+    for name in STRING_COLUMNS:
+        columns[name] = _msgpack_strings(name, payload[name])
+
+    _check_lengths(columns)
+    return pd.DataFrame(columns, copy=False)[RAW_FEATURES]
+
+
+def _msgpack_strings(name: str, value):
+    """Arrow-backed string column from a dictionary-coded, offsets+data or plain-list value."""
+    import pyarrow as pa
+
+    if isinstance(value, list):
+        return np.asarray(value, dtype=object)
+    if not isinstance(value, dict):
+        raise ColumnarError(f'Column {name!r} must be {{codes, categories}}, {{offsets, data}} or an array of str')
+
+    if 'codes' in value:
+        codes, categories = value['codes'], value.get('categories')
+        if not isinstance(codes, bytes) or not isinstance(categories, list):
+            raise ColumnarError(f'Column {name!r}: codes must be a uint8 buffer and categories an array of str')
+        codes = np.frombuffer(codes, dtype='u1')
+        if codes.size and codes.max() >= len(categories):
+            raise ColumnarError(f'Column {name!r}: code {int(codes.max())} has no category')
+        arr = pa.DictionaryArray.from_arrays(codes, pa.array(categories, pa.string())).cast(pa.string())
+    else:
+        offsets, data = value.get('offsets'), value.get('data')
+        if not isinstance(offsets, bytes) or not isinstance(data, bytes) or len(offsets) % 4 or len(offsets) < 4:
+            raise ColumnarError(f'Column {name!r}: offsets must be an int32 buffer (n + 1) and data UTF-8 bytes')
+        bounds = np.frombuffer(offsets, dtype='<i4')
+        if bounds[0] != 0 or bounds[-1] != len(data) or (np.diff(bounds) < 0).any():
+            raise ColumnarError(f'Column {name!r}: offsets must start at 0, never decrease and end at len(data)')
+        arr = pa.StringArray.from_buffers(len(bounds) - 1, pa.py_buffer(offsets), pa.py_buffer(data))
+        try:
+            arr.validate(full=True)
+        except pa.ArrowInvalid as e:
+            raise ColumnarError(f'Column {name!r}: {e}') from e
+    return pd.arrays.ArrowExtensionArray(arr)
+
+
+def _check_columns(names) -> None:
+    missing = [c for c in RAW_FEATURES if c not in set(names)]
+    if missing:
+        raise ColumnarError(f'Missing columns: {missing}')
+
+
+def _check_lengths(columns: dict) -> None:
+    lengths = {name: len(values) for name, values in columns.items()}
+    if len(set(lengths.values())) > 1:
+        raise ColumnarError(f'Columns have different lengths: {lengths}')
+
+
+# ── Validate ──────────────────────────────────────────────────────────────────
+
+def validate(df: pd.DataFrame) -> None:
+    """
+    Vectorised equivalent of the FraudApplication field constraints.
+    Raises ColumnarError listing the offending row count per rule.
+    """
+    checks = {
+        'step must be in [1, 744]':          ~df['step'].between(1, 744).to_numpy(),
+        'type must be one of TX_TYPES':      ~df['type'].isin(TX_TYPES).to_numpy(dtype=bool, na_value=False),
+        'nameOrig must not be null':         df['nameOrig'].isna().to_numpy(),
+        'nameDest must not be null':         df['nameDest'].isna().to_numpy(),
+    }
+    for name in ('amount', 'oldbalanceOrg', 'oldbalanceDest'):
+        values = df[name].to_numpy()
+        checks[f'{name} must be finite and >= 0'] = ~(np.isfinite(values) & (values >= 0))
+
+    errors = []
+    for rule, bad in checks.items():
+        if bad.any():
+            rows = np.flatnonzero(bad)
+            errors.append(f'{rule}: {rows.size} rows (first: {rows[:5].tolist()})')
+    if errors:
+        raise ColumnarError('; '.join(errors))
+
+
+# ── Encode ────────────────────────────────────────────────────────────────────
+
+def msgpack_payload(df: pd.DataFrame) -> bytes:
+    """Client-side MessagePack request body for the RAW_FEATURES columns of `df`."""
+    import msgpack
+    import pyarrow as pa
+
+    payload = {name: df[name].to_numpy(dtype).tobytes() for name, dtype in NUMERIC_DTYPES.items()}
+    types = pd.Categorical(df['type'])
+    payload['type'] = {'codes': types.codes.astype('u1').tobytes(), 'categories': types.categories.tolist()}
+    for name in ('nameOrig', 'nameDest'):
+        arr = pa.array(df[name], pa.string())
+        offsets, data = arr.buffers()[1:]
+        bounds = np.frombuffer(offsets, dtype='<i4', count=len(arr) + 1, offset=arr.offset * 4)
+        payload[name] = {
+            'offsets': (bounds - bounds[0]).tobytes(),
+            'data':    data.to_pybytes()[bounds[0]:bounds[-1]],
+        }
+    return msgpack.packb(payload)
+
+
+def encode(proba: np.ndarray, threshold: float, content_type: str, version: str) -> bytes:
+    """Encode scores in the same format the request arrived in."""
+    proba    = np.ascontiguousarray(proba, dtype='<f8')
+    is_fraud = proba >= threshold
+
+    if media_type(content_type) == ARROW_STREAM:
+        import pyarrow as pa
+
+        table = pa.table(
+            {'fraud_probability': proba, 'is_fraud': is_fraud},
+            metadata={'threshold_used': str(threshold), 'version': version},
+        )
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    import msgpack
+
+    return msgpack.packb({
+        'fraud_probability': proba.tobytes(),
+        'is_fraud':          is_fraud.astype('u1').tobytes(),
+        'threshold_used':    float(threshold),
+        'version':           version,
+    })
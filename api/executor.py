@@ -0,0 +1,271 @@
+# api/executor.py
+"""
+Dedicated inference executor with admission control.
+
+Requests are put on a bounded queue served by a fixed number of scoring
+workers, instead of FastAPI's default threadpool, so overload fails fast:
+
+- queue full                        → QueueFull        (HTTP 429)
+- deadline already unreachable      → DeadlineExceeded (HTTP 503), checked at
+  admission and again by the worker before scoring a job that waited too long
+
+The admission estimate is a per-job overhead (EWMA over small jobs) plus a
+per-row cost (EWMA over larger jobs), applied to the jobs and rows already
+admitted and to the new request's rows, so one large batch does not inflate
+the estimate for single rows. If nothing has been admitted for `probe_s`, the
+next request is let through regardless so a stale estimate cannot lock
+traffic out.
+
+mode='thread'  — workers call the in-process model; intra-op threads of the
+                 estimator and BLAS are pinned to `threads_per_worker`
+mode='process' — each worker thread forwards to its own process in a pool;
+                 every process loads the model once (src.scoring.bulk).
+                 Cascade stage hits counted in the processes are merged
+                 back into `model` so /cascade/stats stays accurate.
+
+`prepare` (optional) runs on every admitted job in the worker thread before
+scoring, e.g. VelocityStore.enrich; its time counts as scoring time, so the
+deadline and load-shedding checks cover it.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+
+
+class QueueFull(Exception):
+    """The executor queue is at capacity."""
+
+
+class DeadlineExceeded(Exception):
+    """The request cannot be (or was not) scored before its deadline."""
+
+
+@dataclass
+class ScoreResult:
+    proba:   object  # np.ndarray of fraud probabilities
+    wait_s:  float   # time spent queued
+    score_s: float   # time spent in the model
+
+
+@dataclass
+class _Job:
+    df:          object
+    rows:        int
+    enqueued_at: float
+    deadline:    float
+    future:      Future
+
+
+class InferenceExecutor:
+
+    def __init__(self, model=None, model_path=None, mode: str = 'thread', workers: int = 1,
+                 threads_per_worker: int = 1, queue_size: int = 32, history: int = 1024,
+                 small_job_rows: int = 16, probe_s: float = 1.0, prepare=None):
+        if mode not in ('thread', 'process'):
+            raise ValueError(f"mode must be 'thread' or 'process', got {mode!r}")
+        if mode == 'thread' and model is None:
+            raise ValueError("mode='thread' needs the loaded model")
+        if mode == 'process' and model_path is None:
+            raise ValueError("mode='process' needs model_path")
+        self.model              = model
+        self.model_path         = model_path
+        self.mode               = mode
+        self.workers            = workers
+        self.threads_per_worker = threads_per_worker
+        self.queue_size         = queue_size
+        self.small_job_rows     = small_job_rows
+        self.probe_s            = probe_s
+        self.prepare            = prepare
+
+        self._queue   = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._pool    = None
+        self._limits  = None
+        self._lock    = threading.Lock()
+        self._waits   = deque(maxlen=history)
+        self._scores  = deque(maxlen=history)
+        self._job_s      = None  # per-job overhead, from jobs of <= small_job_rows rows
+        self._row_s      = None  # per-row cost beyond the overhead, from larger jobs
+        self._pending    = [0, 0]  # admitted, not yet finished: [jobs, rows]
+        self._last_admit = time.perf_counter()
+        self.counters = {'accepted': 0, 'completed': 0, 'rejected_full': 0,
+                         'rejected_deadline': 0, 'expired': 0, 'failed': 0}
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def start(self):
+        from src.scoring.bulk import pin_threads
+
+        if self.mode == 'thread':
+            from threadpoolctl import threadpool_limits
+
+            pin_threads(self.model, self.threads_per_worker)
+            self._limits = threadpool_limits(limits=self.threads_per_worker)
+        else:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_process_worker,
+                initargs=(str(self.model_path), self.threads_per_worker),
+            )
+            # start every process now so model loading is not paid by the first requests
+            for f in [self._pool.submit(_ping) for _ in range(self.workers)]:
+                f.result()
+
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f'inference-{i}', daemon=True)
+            t.start()
+            self._threads.append(t)
+        return self
+
+    def shutdown(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join()
+        self._threads = []
+        if self._limits is not None:
+            self._limits.restore_original_limits()
+            self._limits = None
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    # ── Admission ─────────────────────────────────────────────────────────────
+
+    def submit(self, df, deadline_s: float) -> Future:
+        """Queue raw rows for scoring; the future resolves to a ScoreResult."""
+        now, rows = time.perf_counter(), len(df)
+        with self._lock:
+            expected = self._expected_s(rows)
+            probe    = now - self._last_admit >= self.probe_s
+        if expected is not None and expected > deadline_s and not probe:
+            self._count('rejected_deadline')
+            raise DeadlineExceeded(f'Expected completion in {expected * 1e3:.0f} ms exceeds the deadline')
+
+        job = _Job(df=df, rows=rows, enqueued_at=now, deadline=now + deadline_s, future=Future())
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            self._count('rejected_full')
+            raise QueueFull(f'Inference queue is full ({self.queue_size} pending)')
+        with self._lock:
+            self._pending[0] += 1
+            self._pending[1] += rows
+            self._last_admit  = now
+            self.counters['accepted'] += 1
+        return job.future
+
+    def _expected_s(self, rows: int) -> float | None:
+        """Time until a new job of `rows` rows would finish; None before any job completed."""
+        if self._job_s is None and self._row_s is None:
+            return None
+        job_s, row_s = self._job_s or 0.0, self._row_s or 0.0
+        jobs_ahead, rows_ahead = self._pending
+        ahead = (jobs_ahead * job_s + rows_ahead * row_s) / self.workers
+        return ahead + job_s + rows * row_s
+
+    def _observe(self, rows: int, score_s: float):
+        """Update the cost model with a finished job (caller holds the lock)."""
+        if rows <= self.small_job_rows:
+            self._job_s = score_s if self._job_s is None else 0.8 * self._job_s + 0.2 * score_s
+        else:
+            per_row = max(score_s - (self._job_s or 0.0), 0.0) / rows
+            self._row_s = per_row if self._row_s is None else 0.8 * self._row_s + 0.2 * per_row
+
+    # ── Workers ───────────────────────────────────────────────────────────────
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            start = time.perf_counter()
+            wait_s = start - job.enqueued_at
+            if start >= job.deadline or not job.future.set_running_or_notify_cancel():
+                self._finish(job, 'expired')
+                if not job.future.cancelled():
+                    job.future.set_exception(DeadlineExceeded(f'Expired after {wait_s * 1e3:.0f} ms in queue'))
+                continue
+            try:
+                proba = self._score(job.df)
+            except Exception as e:
+                self._finish(job, 'failed')
+                job.future.set_exception(e)
+                continue
+            score_s = time.perf_counter() - start
+            with self._lock:
+                self._waits.append(wait_s)
+                self._scores.append(score_s)
+                self._observe(job.rows, score_s)
+            self._finish(job, 'completed')
+            job.future.set_result(ScoreResult(proba=proba, wait_s=wait_s, score_s=score_s))
+
+    def _finish(self, job: _Job, outcome: str):
+        with self._lock:
+            self._pending[0] -= 1
+            self._pending[1] -= job.rows
+            self.counters[outcome] += 1
+
+    def _score(self, df):
+        if self.prepare is not None:
+            df = self.prepare(df)
+        if self.mode == 'process':
+            from src.scoring.bulk import predict_chunk_counted
+
+            proba, hits = self._pool.submit(predict_chunk_counted, df).result()
+            if hits and hasattr(self.model, 'add_counts'):
+                self.model.add_counts(hits)
+            return proba
+        from src.data.loader import to_model_input
+
+        return self.model.predict_proba(to_model_input(df))[:, 1]
+
+    # ── Reporting ─────────────────────────────────────────────────────────────
+
+    def _count(self, key: str):
+        with self._lock:
+            self.counters[key] += 1
+
+    def stats(self) -> dict:
+        import numpy as np
+
+        with self._lock:
+            waits, scores = np.array(self._waits), np.array(self._scores)
+            counters = dict(self.counters)
+            job_s, row_s = self._job_s, self._row_s
+
+        def _pcts(values):
+            if not values.size:
+                return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None}
+            p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1e3
+            return {'p50_ms': round(float(p50), 3), 'p95_ms': round(float(p95), 3), 'p99_ms': round(float(p99), 3)}
+
+        return {
+            'mode':          self.mode,
+            'workers':       self.workers,
+            'queue_depth':   self._queue.qsize(),
+            'queue_size':    self.queue_size,
+            'counters':      counters,
+            'queue_wait':    _pcts(waits),
+            'scoring_time':  _pcts(scores),
+            'cost_model':    {'job_ms': None if job_s is None else round(job_s * 1e3, 3),
+                              'row_us': None if row_s is None else round(row_s * 1e6, 3)},
+        }
+
+
+def _init_process_worker(model_path, n_threads):
+    from src.data.loader import synthetic_transactions
+    from src.features.velocity import with_fresh_history
+    from src.scoring import bulk
+
+    bulk._init_worker(model_path, n_threads)
+    bulk.predict_chunk(with_fresh_history(bulk._MODEL, synthetic_transactions(16)))  # warm-up
+    if hasattr(bulk._MODEL, 'reset_counters'):
+        bulk._MODEL.reset_counters()
+
+
+def _ping():
+    return True
@@ -1,9 +1,14 @@
-import joblib
+import asyncio
+import importlib
+import time
 from pathlib import Path
-import yaml
-import pandas as pd
-from fastapi import FastAPI, HTTPException
-from api.schemas import FraudApplication, FraudPrediction, HealthCheck
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from api.schemas import FraudApplication, FraudPrediction, HealthCheck, StartupProfile, CascadeStats, ExecutorStats
+
+# pandas, yaml, joblib (and sklearn / xgboost through the pickle) are imported
+# lazily in ModelServer.load — module import stays cheap for the worker process
+_HEAVY_MODULES = ['yaml', 'numpy', 'pandas', 'joblib', 'sklearn.pipeline', 'xgboost']
 
 BASE_DIR   = Path(__file__).parent.parent
 MODELS_DIR = BASE_DIR / 'models'
@@ -19,17 +24,132 @@ class ModelServer:
     def __init__(self):
         self.model     = None
         self.threshold = 0.5
+        self.is_warm   = False
+        self.max_batch_rows = 200_000
+        self.executor  = None
+        self.velocity_store    = None
+        self.deadline_ms       = 250
+        self.batch_deadline_ms = 30_000
+        self.profile   = {'imports': {}, 'load_s': None, 'warmup_s': None, 'total_s': None}
 
     def load(self):
+        start = time.perf_counter()
         try:
+            for name in _HEAVY_MODULES:
+                t0 = time.perf_counter()
+                importlib.import_module(name)
+                self.profile['imports'][name] = round(time.perf_counter() - t0, 4)
+
+            import yaml
+            import joblib
+
+            t0 = time.perf_counter()
             with open(PARAMS_PATH, 'r') as f:
                 config = yaml.safe_load(f)
             self.threshold = config['v1_xgboost']['deployment']['threshold']
-            self.model     = joblib.load(MODELS_DIR / 'fraud_detection_v1_xgb.pkl')
+            self.max_batch_rows = config.get('api', {}).get('batch', {}).get('max_rows', self.max_batch_rows)
+            use_cascade    = config.get('api', {}).get('cascade', {}).get('enabled', False)
+            velocity       = config.get('api', {}).get('velocity', {})
+            if use_cascade:
+                model_path = MODELS_DIR / 'fraud_detection_v1_cascade.pkl'
+            elif velocity.get('enabled', False):
+                model_path = MODELS_DIR / 'fraud_detection_v1_xgb_velocity.pkl'
+            else:
+                model_path = MODELS_DIR / 'fraud_detection_v1_xgb.pkl'
+            self.model     = joblib.load(model_path)
+            self.profile['load_s'] = round(time.perf_counter() - t0, 4)
             print(f'Model loaded. Threshold: {self.threshold}')
+
+            warmup = config.get('api', {}).get('warmup', {})
+            if warmup.get('enabled', True):
+                t0 = time.perf_counter()
+                self.warmup(batch_rows=warmup.get('batch_rows', 256), runs=warmup.get('runs', 3))
+                self.profile['warmup_s'] = round(time.perf_counter() - t0, 4)
+
+            from src.features.velocity import VelocityStore, velocity_step
+
+            step = velocity_step(self.model)
+            if step is not None:
+                self.velocity_store = VelocityStore(
+                    windows=step.windows,
+                    maxlen=velocity.get('maxlen', 64),
+                    max_accounts=velocity.get('max_accounts', 1_000_000),
+                )
+
+            executor = config.get('api', {}).get('executor', {})
+            if executor.get('enabled', False):
+                self.start_executor(model_path=model_path, **executor)
+            self.is_warm = True
         except Exception as e:
             print(f'Error loading artifacts: {e}')
             raise
+        self.profile['total_s'] = round(time.perf_counter() - start, 4)
+        print(f'Startup profile: {self.profile}')
+
+    def warmup(self, batch_rows: int = 256, runs: int = 3):
+        """
+        Score synthetic rows so one-time costs (lazy imports inside sklearn,
+        XGBoost predictor setup, pandas dtype paths) are paid before serving.
+        """
+        from src.data.loader import synthetic_transactions, to_model_input
+        from src.features.velocity import with_fresh_history
+
+        batch = to_model_input(with_fresh_history(self.model, synthetic_transactions(max(batch_rows, runs, 1))))
+        self.model.predict_proba(batch)
+        for i in range(runs):
+            self.model.predict_proba(batch.iloc[[i]])
+        if hasattr(self.model, 'reset_counters'):
+            self.model.reset_counters()
+
+    def start_executor(self, model_path=None, mode: str = 'thread', workers: int = 1,
+                       threads_per_worker: int = 1, queue_size: int = 32,
+                       deadline_ms: float = 250, batch_deadline_ms: float = 30_000, **_):
+        from api.executor import InferenceExecutor
+
+        self.deadline_ms       = deadline_ms
+        self.batch_deadline_ms = batch_deadline_ms
+        self.executor = InferenceExecutor(
+            model=self.model, model_path=model_path, mode=mode, workers=workers,
+            threads_per_worker=threads_per_worker, queue_size=queue_size,
+            # velocity enrichment runs inside the admitted job, behind the queue and deadlines
+            prepare=self.velocity_store.enrich if self.velocity_store is not None else None,
+        ).start()
+        print(f'Inference executor: {mode} × {workers}, {threads_per_worker} thread(s) each, queue {queue_size}')
+
+    async def score(self, df, deadline_ms: float):
+        """
+        Score raw rows through the executor (or the default threadpool when it
+        is disabled). Overload surfaces as 429 (queue full) / 503 (deadline).
+        """
+        from api.executor import DeadlineExceeded, QueueFull, ScoreResult
+
+        if self.executor is None:
+            t0    = time.perf_counter()
+            proba = await run_in_threadpool(_predict, df)
+            return ScoreResult(proba=proba, wait_s=0.0, score_s=time.perf_counter() - t0)
+
+        deadline_s = deadline_ms / 1e3
+        try:
+            future = self.executor.submit(df, deadline_s)
+        except QueueFull as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={'Retry-After': '1'})
+        except DeadlineExceeded as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={'Retry-After': '1'})
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=deadline_s)
+        except (asyncio.TimeoutError, DeadlineExceeded) as e:
+            raise HTTPException(status_code=503, detail=str(e) or 'Deadline exceeded', headers={'Retry-After': '1'})
+
+def _predict(df):
+    from src.data.loader import to_model_input
+
+    if server.velocity_store is not None:
+        df = server.velocity_store.enrich(df)
+    return server.model.predict_proba(to_model_input(df))[:, 1]
+
+def _timing_headers(response: Response, result):
+    response.headers['X-Queue-Wait-Ms'] = f'{result.wait_s * 1e3:.3f}'
+    response.headers['X-Score-Ms']      = f'{result.score_s * 1e3:.3f}'
 
 server = ModelServer()
 
@@ -37,33 +157,113 @@ server = ModelServer()
 def startup_event():
     server.load()
 
+@app.on_event('shutdown')
+def shutdown_event():
+    if server.executor is not None:
+        server.executor.shutdown()
+
 @app.get('/health', response_model=HealthCheck)
-def health():
+def health(response: Response):
+    is_ready = server.model is not None and server.is_warm
+    if not is_ready:
+        response.status_code = 503
     return {
-        'status':          'ok',
+        'status':          'ok' if is_ready else 'starting',
         'is_model_loaded': server.model is not None,
+        'is_warm':         server.is_warm,
         'version':         '1.0.0'
     }
 
+@app.get('/health/startup', response_model=StartupProfile)
+def startup_profile():
+    return server.profile
+
+@app.get('/cascade/stats', response_model=CascadeStats)
+def cascade_stats():
+    counters = getattr(server.model, 'counters', None)
+    if counters is None:
+        raise HTTPException(status_code=404, detail='Cascade scorer not enabled')
+    total = sum(counters.values())
+    return {
+        'hits':  counters,
+        'share': {stage: (n / total if total else 0.0) for stage, n in counters.items()},
+        'bands': {'low': server.model.low, 'high': min(server.model.high, 1.0)},
+    }
+
+@app.get('/executor/stats', response_model=ExecutorStats)
+def executor_stats():
+    if server.executor is None:
+        raise HTTPException(status_code=404, detail='Inference executor not enabled')
+    return server.executor.stats()
+
 @app.post('/predict', response_model=FraudPrediction)
-def predict(transaction: FraudApplication):
+async def predict(transaction: FraudApplication, response: Response,
+                  x_deadline_ms: float | None = Header(None, gt=0)):
     if server.model is None:
         raise HTTPException(status_code=503, detail='Model not loaded')
+    import pandas as pd
+
     try:
-        data = transaction.model_dump()
-        # Pipeline drops these internally — placeholders required
-        data['newbalanceOrig'] = 0.0
-        data['newbalanceDest'] = 0.0
-        data['isFlaggedFraud'] = 0
-
-        input_df = pd.DataFrame([data])
-        y_prob   = server.model.predict_proba(input_df)[0, 1]
-
-        return {
-            'fraud_probability': float(y_prob),
-            'is_fraud':          bool(y_prob >= server.threshold),
-            'threshold_used':    server.threshold,
-            'version':           '1.0.0'
-        }
+        result = await server.score(pd.DataFrame([transaction.model_dump()]), x_deadline_ms or server.deadline_ms)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+    _timing_headers(response, result)
+    y_prob = result.proba[0]
+
+    return {
+        'fraud_probability': float(y_prob),
+        'is_fraud':          bool(y_prob >= server.threshold),
+        'threshold_used':    server.threshold,
+        'version':           '1.0.0'
+    }
+
+@app.post('/predict/batch')
+async def predict_batch(request: Request, x_deadline_ms: float | None = Header(None, gt=0)):
+    """
+    Bulk scoring from a columnar payload (Arrow IPC stream or MessagePack).
+    See api/columnar.py for the wire format; the response uses the same one.
+    """
+    if server.model is None:
+        raise HTTPException(status_code=503, detail='Model not loaded')
+    from api import columnar
+
+    content_type = request.headers.get('content-type')
+    try:
+        media = columnar.media_type(content_type)
+    except LookupError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+
+    body = await request.body()
+    try:
+        df = await run_in_threadpool(_decode_columnar, body, media)
+    except columnar.ColumnarError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    try:
+        if df.empty:
+            proba, result = df['amount'].to_numpy(dtype='float64'), None
+        else:
+            result = await server.score(df, x_deadline_ms or server.batch_deadline_ms)
+            proba  = result.proba
+        content = await run_in_threadpool(columnar.encode, proba, server.threshold, media, '1.0.0')
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    response = Response(content=content, media_type=media)
+    if result is not None:
+        _timing_headers(response, result)
+    return response
+
+def _decode_columnar(body: bytes, media: str):
+    """Decode and validate a columnar payload (runs off the event loop)."""
+    from api import columnar
+
+    df = columnar.decode(body, media)
+    if len(df) > server.max_batch_rows:
+        raise columnar.ColumnarError(f'Batch of {len(df)} rows exceeds max_rows={server.max_batch_rows}')
+    columnar.validate(df)
+    return df
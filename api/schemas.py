@@ -33,4 +33,26 @@ class FraudPrediction(BaseModel):
 class HealthCheck(BaseModel):
     status:          str
     is_model_loaded: bool
-    version:         str
\ No newline at end of file
+    is_warm:         bool
+    version:         str
+
+class StartupProfile(BaseModel):
+    imports:  dict[str, float] = Field(..., description='Seconds spent importing each heavy module')
+    load_s:   float | None     = Field(None, description='Seconds spent reading params and unpickling the pipeline')
+    warmup_s: float | None     = Field(None, description='Seconds spent on synthetic warm-up inference')
+    total_s:  float | None     = Field(None, description='Seconds from startup hook to ready')
+
+class CascadeStats(BaseModel):
+    hits:  dict[str, int]   = Field(..., description='Rows resolved per stage (rule / light / full) since startup')
+    share: dict[str, float] = Field(..., description='Fraction of rows resolved per stage')
+    bands: dict[str, float] = Field(..., description='Light-model band; the full model scores low <= p < high')
+
+class ExecutorStats(BaseModel):
+    mode:         str
+    workers:      int
+    queue_depth:  int
+    queue_size:   int
+    counters:     dict[str, int]          = Field(..., description='accepted / completed / rejected_full / rejected_deadline / expired / failed')
+    queue_wait:   dict[str, float | None] = Field(..., description='Time spent queued (recent requests)')
+    scoring_time: dict[str, float | None] = Field(..., description='Time spent in the model (recent requests)')
+    cost_model:   dict[str, float | None] = Field(..., description='Admission estimate: per-job overhead (ms) and per-row cost (µs)')
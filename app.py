@@ -3,8 +3,20 @@ import pandas as pd
 import numpy as np
 import joblib
 import yaml
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from src.config import RAW_FEATURES, TARGET
+from src.data.loader import synthetic_transactions, to_model_input
+from src.evaluation.sensitivity import axis_values, score_grid
+from src.scoring.bulk import iter_chunks
+from src.scoring.stream import RiskSummary
+
+BATCH_CHUNK_ROWS = 50_000  # rows parsed and scored per step on the upload page
+BATCH_TOP_K      = 500     # rows kept in the top-risk table
+BATCH_TMP_PREFIX = "fraud-sentinel-batch-"
 
 # ── Page Config ──────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -21,10 +33,98 @@ def load_artifacts():
     model     = joblib.load("models/fraud_detection_v1_xgb.pkl")
     threshold = config['v1_xgboost']['deployment']['threshold']
     pr_auc    = config['v1_xgboost']['deployment']['pr_auc']
+    # warm-up: pay XGBoost's first-call costs here instead of on the first click
+    model.predict_proba(to_model_input(synthetic_transactions(1)))
     return model, threshold, pr_auc
 
 model, threshold, pr_auc = load_artifacts()
 
+
+@st.cache_resource
+def sweep_batch_dirs():
+    """Once per process: remove scored-upload dirs left behind by earlier (killed) processes."""
+    started = time.time()
+    for path in Path(tempfile.gettempdir()).glob(f"{BATCH_TMP_PREFIX}*"):
+        if path.stat().st_mtime < started:
+            shutil.rmtree(path, ignore_errors=True)
+
+sweep_batch_dirs()
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def sensitivity_grid(_model, base: tuple, y_col: str, resolution: int):
+    """Score the amount × y_col grid around `base` in a single predict_proba call."""
+    base     = dict(base)
+    x_values = axis_values("amount", base["amount"], resolution)
+    y_values = axis_values(y_col, base[y_col], resolution)
+    start    = time.perf_counter()
+    proba    = score_grid(_model, base, "amount", x_values, y_col, y_values)
+    return proba, x_values, y_values, time.perf_counter() - start
+
+
+def render_footer():
+    st.divider()
+    st.caption(
+        "Fraud Sentinel V1 · PaySim Dataset · XGBoost Default · "
+        "PR-AUC 0.9079 · Threshold optimized for Recall ≥ 85%"
+    )
+
+
+def render_batch_results(slots, summary, rows_per_s, final=False):
+    slots["metrics"].markdown(
+        f"**{summary.rows:,}** rows scored · **{summary.flagged:,}** flagged "
+        f"({summary.flagged / max(summary.rows, 1):.2%}) · {rows_per_s:,.0f} rows/s"
+        + ("" if final else " · scoring…")
+    )
+    slots["table"].dataframe(
+        summary.top.sort_values("fraud_probability", ascending=False),
+        use_container_width=True,
+        hide_index=True,
+    )
+    slots["hist"].bar_chart(summary.histogram(), y="rows")
+
+
+def batch_dir() -> str:
+    """
+    This session's scratch dir for scored uploads. TemporaryDirectory removes
+    it via weakref.finalize once the session state is dropped, or at exit.
+    """
+    if "batch_dir" not in st.session_state:
+        st.session_state["batch_dir"] = tempfile.TemporaryDirectory(prefix=BATCH_TMP_PREFIX)
+    return st.session_state["batch_dir"].name
+
+
+def score_upload(uploaded, columns, slots):
+    """
+    Parse and score the upload chunk by chunk. The top-risk table and histogram
+    are refreshed after every chunk; scored rows are appended to a CSV in the
+    session's batch_dir (one file per session, replaced by the next upload) so
+    memory stays bounded by the chunk size.
+    """
+    summary = RiskSummary(threshold, top_k=BATCH_TOP_K)
+    out     = open(os.path.join(batch_dir(), "scored.csv"), "w")
+    start, offset = time.perf_counter(), 0
+
+    with out:
+        for chunk in iter_chunks(uploaded, BATCH_CHUNK_ROWS, columns):
+            proba  = model.predict_proba(to_model_input(chunk))[:, 1]
+            scored = chunk.assign(fraud_probability=proba, is_fraud=proba >= threshold)
+            scored.insert(0, "row", range(offset, offset + len(chunk)))
+            scored.to_csv(out, header=offset == 0, index=False)
+            offset += len(chunk)
+
+            summary.update(scored)
+            slots["progress"].progress(min(uploaded.tell() / max(uploaded.size, 1), 1.0))
+            render_batch_results(slots, summary, offset / (time.perf_counter() - start))
+
+    return {
+        "file_id":    uploaded.file_id,
+        "summary":    summary,
+        "output":     out.name,
+        "rows_per_s": offset / (time.perf_counter() - start),
+    }
+
+
 # ── Header ────────────────────────────────────────────────────────────────────
 st.title("🛡️ Fraud Sentinel — PaySim V1")
 st.caption(
@@ -33,6 +133,58 @@ st.caption(
 )
 st.divider()
 
+page = st.sidebar.radio("Page", ["Single Transaction", "Batch Upload"])
+
+# ── Batch Upload ──────────────────────────────────────────────────────────────
+if page == "Batch Upload":
+    st.subheader("Batch Scoring")
+    uploaded = st.file_uploader(
+        "PaySim-format CSV",
+        type="csv",
+        help=f"Needs columns {', '.join(RAW_FEATURES)}. Other columns are ignored except `{TARGET}`.",
+    )
+
+    if uploaded is None:
+        st.info("Upload a CSV to score every transaction with the deployed model.")
+    else:
+        header  = pd.read_csv(uploaded, nrows=0).columns
+        uploaded.seek(0)
+        missing = [c for c in RAW_FEATURES if c not in header]
+        if missing:
+            st.error(f"Missing required columns: {', '.join(missing)}")
+        else:
+            columns = RAW_FEATURES + ([TARGET] if TARGET in header else [])
+            slots = {
+                "progress": st.empty(),
+                "metrics":  st.empty(),
+            }
+            col_table, col_hist = st.columns([3, 2], gap="large")
+            with col_table:
+                st.markdown("**Top-risk transactions**")
+                slots["table"] = st.empty()
+            with col_hist:
+                st.markdown("**Fraud probability distribution**")
+                slots["hist"] = st.empty()
+
+            # score once per file — widget reruns (e.g. the download) reuse the result
+            result = st.session_state.get("batch")
+            if result is None or result["file_id"] != uploaded.file_id:
+                result = score_upload(uploaded, columns, slots)
+                st.session_state["batch"] = result
+
+            slots["progress"].empty()
+            render_batch_results(slots, result["summary"], result["rows_per_s"], final=True)
+            with open(result["output"], "rb") as f:
+                st.download_button(
+                    "⬇️ Download scored CSV",
+                    data=f,
+                    file_name=f"scored_{uploaded.name}",
+                    mime="text/csv",
+                )
+
+    render_footer()
+    st.stop()
+
 # ── Layout ────────────────────────────────────────────────────────────────────
 left, right = st.columns([1, 1], gap="large")
 
@@ -120,6 +272,9 @@ with right:
         )
 
         # ── Risk Gauge ──
+        # matplotlib is only needed once a result is drawn — keep it off the cold start
+        import matplotlib.pyplot as plt
+
         fig, ax = plt.subplots(figsize=(6, 1.2))
         fig.patch.set_alpha(0)
         ax.set_facecolor("#0e1117")
@@ -191,9 +346,51 @@ with right:
         - Destination account historical behavior
         """)
 
-# ── Footer ────────────────────────────────────────────────────────────────────
+# ── What-if Sensitivity ───────────────────────────────────────────────────────
 st.divider()
-st.caption(
-    "Fraud Sentinel V1 · PaySim Dataset · XGBoost Default · "
-    "PR-AUC 0.9079 · Threshold optimized for Recall ≥ 85%"
-)
\ No newline at end of file
+st.subheader("What-if Sensitivity")
+
+if st.toggle("Show where the model flips around this transaction"):
+    import matplotlib.pyplot as plt
+
+    col_axis, col_res = st.columns(2)
+    with col_axis:
+        y_axis = st.radio("Second axis", ["Destination balance", "Hour of day"], horizontal=True)
+    with col_res:
+        resolution = st.slider("Grid resolution", min_value=20, max_value=150, value=100, step=10)
+    y_col = "oldbalanceDest" if y_axis == "Destination balance" else "step"
+
+    base = (
+        ("step",           int(step)),
+        ("type",           tx_type),
+        ("amount",         float(amount)),
+        ("nameOrig",       "C000000000"),
+        ("oldbalanceOrg",  float(old_balance_org)),
+        ("nameDest",       "C999999999"),
+        ("oldbalanceDest", float(old_balance_dest)),
+    )
+    grid, x_values, y_values, elapsed = sensitivity_grid(model, base, y_col, resolution)
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    mesh = ax.pcolormesh(x_values, y_values, grid, cmap="RdYlGn_r", vmin=0, vmax=1, shading="auto")
+    if grid.min() < threshold < grid.max():
+        ax.contour(x_values, y_values, grid, levels=[threshold], colors="black", linewidths=1.5)
+    ax.scatter([max(amount, x_values[0])], [dict(base)[y_col]], marker="x", color="black", s=80,
+               label="Entered transaction")
+    ax.set_xscale("log")
+    if y_col == "oldbalanceDest":
+        ax.set_yscale("symlog", linthresh=1.0)
+    ax.set_xlabel("Transaction Amount ($)")
+    ax.set_ylabel("Destination Balance ($)" if y_col == "oldbalanceDest" else "Hour of day")
+    ax.legend(loc="upper right", fontsize=8)
+    fig.colorbar(mesh, ax=ax, label="Fraud probability")
+    st.pyplot(fig)
+    plt.close(fig)
+
+    st.caption(
+        f"{grid.size:,} what-if transactions scored in one call ({elapsed * 1e3:.0f} ms, cached across reruns). "
+        f"Black line: operating threshold `{threshold:.4f}`."
+    )
+
+# ── Footer ────────────────────────────────────────────────────────────────────
+render_footer()
\ No newline at end of file
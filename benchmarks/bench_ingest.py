@@ -0,0 +1,111 @@
+# benchmarks/bench_ingest.py
+"""
+JSON vs columnar ingest for bulk scoring.
+
+For each batch size, times the full request path in-process (no HTTP stack):
+
+  json     — json.dumps(records) → pydantic list[FraudApplication] → DataFrame → predict
+  arrow    — Arrow IPC stream    → api.columnar decode/validate → predict → encode
+  msgpack       — MessagePack columns, strings dictionary / offsets encoded
+                  (api.columnar.msgpack_payload) → decode/validate → predict → encode
+  msgpack_list  — same, but string columns sent as plain arrays of str: the
+                  difference to `msgpack` is the per-row string decode cost
+
+Usage:
+    python -m benchmarks.bench_ingest                       # uses models/fraud_detection_v1_xgb.pkl
+    python -m benchmarks.bench_ingest --rows 10000 100000 --repeats 5
+"""
+import argparse
+import json
+import time
+
+import joblib
+import msgpack
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pydantic import TypeAdapter
+
+from api import columnar
+from api.schemas import FraudApplication
+from src.config import MODELS_DIR
+from src.data.loader import synthetic_transactions, to_model_input
+
+THRESHOLD = 0.2226
+
+
+def _arrow_body(df: pd.DataFrame) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink  = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _msgpack_list_body(df: pd.DataFrame) -> bytes:
+    payload = {name: df[name].to_numpy(dtype).tobytes() for name, dtype in columnar.NUMERIC_DTYPES.items()}
+    payload.update({name: df[name].tolist() for name in columnar.STRING_COLUMNS})
+    return msgpack.packb(payload)
+
+
+def run_json(model, body: bytes) -> np.ndarray:
+    records = TypeAdapter(list[FraudApplication]).validate_json(body)
+    df      = pd.DataFrame([r.model_dump() for r in records])
+    proba   = model.predict_proba(to_model_input(df))[:, 1]
+    json.dumps([{'fraud_probability': float(p), 'is_fraud': bool(p >= THRESHOLD)} for p in proba])
+    return proba
+
+
+def run_columnar(model, body: bytes, media: str) -> np.ndarray:
+    df = columnar.decode(body, media)
+    columnar.validate(df)
+    proba = model.predict_proba(to_model_input(df))[:, 1]
+    columnar.encode(proba, THRESHOLD, media, version='1.0.0')
+    return proba
+
+
+def _best_of(fn, repeats: int) -> float:
+    """Wall time in seconds of the fastest of `repeats` runs."""
+    best = None
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=str(MODELS_DIR / 'fraud_detection_v1_xgb.pkl'))
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    model.predict_proba(to_model_input(synthetic_transactions(256)))  # warm-up
+
+    print(f"{'rows':>8} {'path':>12} {'total ms':>10} {'model ms':>10} {'ingest ms':>10} {'rows/s':>12}")
+    for n in args.rows:
+        df     = synthetic_transactions(n)
+        bodies = {
+            'json':    df.to_json(orient='records').encode(),
+            'arrow':   _arrow_body(df),
+            'msgpack':      columnar.msgpack_payload(df),
+            'msgpack_list': _msgpack_list_body(df),
+        }
+        model_s = _best_of(lambda: model.predict_proba(to_model_input(df)), args.repeats)
+        runners = {
+            'json':    lambda: run_json(model, bodies['json']),
+            'arrow':   lambda: run_columnar(model, bodies['arrow'], columnar.ARROW_STREAM),
+            'msgpack':      lambda: run_columnar(model, bodies['msgpack'], columnar.MSGPACK),
+            'msgpack_list': lambda: run_columnar(model, bodies['msgpack_list'], columnar.MSGPACK),
+        }
+        for path, fn in runners.items():
+            total = _best_of(fn, args.repeats)
+            print(f'{n:>8,} {path:>12} {total * 1e3:>10.1f} {model_s * 1e3:>10.1f} '
+                  f'{(total - model_s) * 1e3:>10.1f} {n / total:>12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import logging
+import pickle
+import yaml
+from src.config import PAYSIM_PATH, ROOT
+from src.data.loader import load_paysim, filter_and_clean
+from src.data.splitter import split_data
+from src.features.velocity import velocity_step
+from src.models.compaction import compact_search, choose_variant
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(message)s")
+log = logging.getLogger(__name__)
+
+def compact(budget_ms: float, latency: str = "single_p50_ms", min_recall: float = 0.0,
+            teacher_name: str = "xgb", n_threads: int = None):
+    with open(ROOT / "params.yaml") as f:
+        params = yaml.safe_load(f)
+    # recall / precision at the deployed threshold, as score.py and the API use it
+    threshold = params["v1_xgboost"]["deployment"]["threshold"]
+    if n_threads is None:
+        # measure under the thread count the API executor pins each worker to
+        n_threads = params.get("api", {}).get("executor", {}).get("threads_per_worker", 1)
+
+    with open(ROOT / "models" / f"fraud_detection_v1_{teacher_name}.pkl", "rb") as f:
+        teacher = pickle.load(f)
+
+    log.info("Loading data...")
+    df = load_paysim(PAYSIM_PATH)
+    step = velocity_step(teacher)
+    if step is not None:
+        # as in train.py: over the whole raw stream, before filtering and splitting
+        df = step.compute(df)
+    X, y = filter_and_clean(df)
+    # same split as train.py — the teacher has never seen X_test
+    X_train, X_test, y_train, y_test = split_data(X, y, test_size=0.15)
+
+    log.info(f"Building and measuring variants ({n_threads} thread(s))...")
+    table, variants = compact_search(teacher, X_train, y_train, X_test, y_test, threshold, n_threads=n_threads)
+    log.info("\n" + table.sort_values(latency).round(4).to_string())
+
+    chosen = choose_variant(table, budget_ms, latency=latency, min_recall=min_recall)
+    out = ROOT / "models" / "fraud_detection_v1_compact.pkl"
+    with open(out, "wb") as f:
+        pickle.dump(variants[chosen], f)
+    table.assign(chosen=table.index == chosen).to_csv(ROOT / "models" / "compaction_report_v1.csv")
+
+    log.info(f"Chosen: {chosen} ({latency}={table.loc[chosen, latency]:.3f}, "
+             f"PR-AUC={table.loc[chosen, 'pr_auc']:.4f}) → {out}")
+    return table, chosen
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Search smaller model variants under a latency budget.")
+    parser.add_argument("--budget", type=float, required=True,
+                        help="Latency budget in the unit of --latency (ms for single_*, µs/row for batch)")
+    parser.add_argument("--latency", default="single_p50_ms",
+                        choices=["single_p50_ms", "single_p95_ms", "batch_us_per_row"])
+    parser.add_argument("--min-recall", type=float, default=0.0,
+                        help="Reject variants below this recall at the operating threshold")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="Threads per model during measurement (default: api.executor.threads_per_worker)")
+    parser.add_argument("--teacher", default="xgb",
+                        help="Teacher model: models/fraud_detection_v1_<teacher>.pkl (e.g. xgb_velocity)")
+    args = parser.parse_args()
+    compact(args.budget, latency=args.latency, min_recall=args.min_recall,
+            teacher_name=args.teacher, n_threads=args.threads)
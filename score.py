@@ -0,0 +1,48 @@
+import argparse
+import logging
+import yaml
+from src.config import ROOT, MODELS_DIR
+from src.scoring.bulk import score_file
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(message)s")
+log = logging.getLogger(__name__)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Bulk-score a PaySim-format CSV or Parquet file into a Parquet output. "
+                    "Rerun the same command to resume an interrupted run."
+    )
+    parser.add_argument("input", help="PaySim-format .csv or .parquet file")
+    parser.add_argument("output", help="Output .parquet file (row, [kept columns], fraud_probability, is_fraud)")
+    parser.add_argument("--model", default=str(MODELS_DIR / "fraud_detection_v1_xgb.pkl"))
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Decision threshold (default: params.yaml deployment threshold)")
+    parser.add_argument("--chunk-rows", type=int, default=250_000)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--keep", nargs="*", default=[], metavar="COLUMN",
+                        help="Input columns copied to the output, e.g. nameOrig isFraud")
+    parser.add_argument("--no-merge", action="store_true",
+                        help="Leave per-chunk part files instead of merging into one file")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    threshold = args.threshold
+    if threshold is None:
+        with open(ROOT / "params.yaml") as f:
+            threshold = yaml.safe_load(f)["v1_xgboost"]["deployment"]["threshold"]
+
+    score_file(
+        args.input,
+        args.output,
+        model_path=args.model,
+        threshold=threshold,
+        chunk_rows=args.chunk_rows,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        keep_columns=args.keep,
+        merge=not args.no_merge,
+    )
@@ -5,10 +5,23 @@ ROOT = Path(__file__).parent.parent
 PAYSIM_PATH   = ROOT / 'data' / 'raw' / 'PS_20174392719_1491204439457_log.csv'
 PROCESSED_DIR = ROOT / 'data' / 'processed'
 MODELS_DIR    = ROOT / 'models'
+FEATURE_CACHE_DIR = ROOT / 'data' / 'cache' / 'features'
 
 FRAUD_TYPES = ['TRANSFER', 'CASH_OUT']
+TX_TYPES    = ['TRANSFER', 'CASH_OUT', 'CASH_IN', 'PAYMENT', 'DEBIT']
 TARGET      = 'isFraud'
 
+# raw fields a client sends for scoring (see api/schemas.FraudApplication)
+RAW_FEATURES = [
+    'step',
+    'type',
+    'amount',
+    'nameOrig',
+    'oldbalanceOrg',
+    'nameDest',
+    'oldbalanceDest',
+]
+
 DROP_COLS = [
     'newbalanceOrig',
     'newbalanceDest',
@@ -39,4 +52,13 @@ BINARY_FEATURES = [
 ]
 
 CYCLICAL_FEATURES = ['hour_sin', 'hour_cos']
+
+# past-only windows (in steps = hours) for src/features/velocity.py
+VELOCITY_WINDOWS  = [1, 24]
+VELOCITY_FEATURES = [
+    f'{entity}_{stat}_{w}h'
+    for entity in ('orig', 'dest')
+    for w in VELOCITY_WINDOWS
+    for stat in ('count', 'amount')
+]
 RANDOM_SEED = 42
\ No newline at end of file
@@ -1,6 +1,7 @@
 # src/data/loader.py
+import numpy as np
 import pandas as pd
-from src.config import PAYSIM_PATH, FRAUD_TYPES, DROP_COLS, TARGET
+from src.config import PAYSIM_PATH, FRAUD_TYPES, DROP_COLS, TARGET, RAW_FEATURES, VELOCITY_FEATURES
 
 _DTYPES = {
     'step':           'int16',
@@ -41,3 +42,34 @@ def filter_and_clean(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
     X = df.drop(columns=[TARGET])
     y = df[TARGET]
     return X, y
+
+
+def to_model_input(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shape raw scoring rows (RAW_FEATURES) into the frame the pipeline expects.
+    The dropped columns are never used by the model — placeholders required.
+    Velocity columns already filled by a VelocityStore are kept.
+    """
+    df = df[RAW_FEATURES + [c for c in VELOCITY_FEATURES if c in df.columns]].copy()
+    df['newbalanceOrig'] = 0.0
+    df['newbalanceDest'] = 0.0
+    df['isFlaggedFraud'] = 0
+    return df
+
+
+def synthetic_transactions(n_rows: int = 1, seed: int = 0) -> pd.DataFrame:
+    """
+    Plausible raw TRANSFER / CASH_OUT rows (RAW_FEATURES only).
+    Used to warm up a freshly loaded pipeline without touching real data.
+    """
+    rng    = np.random.default_rng(seed)
+    amount = rng.lognormal(mean=11, sigma=1.5, size=n_rows).round(2)
+    return pd.DataFrame({
+        'step':           rng.integers(1, 744, size=n_rows),
+        'type':           rng.choice(FRAUD_TYPES, size=n_rows),
+        'amount':         amount,
+        'nameOrig':       [f'C{i:09d}' for i in range(n_rows)],
+        'oldbalanceOrg':  amount * rng.uniform(0.5, 2.0, size=n_rows),
+        'nameDest':       [f'C{i:09d}' for i in range(n_rows, 2 * n_rows)],
+        'oldbalanceDest': np.where(rng.random(n_rows) < 0.5, 0.0, amount),
+    })
@@ -1,6 +1,5 @@
 # src/evaluation/metrics.py
 from sklearn.metrics import precision_recall_curve, classification_report, roc_auc_score, auc, confusion_matrix, precision_score, recall_score, f1_score
-import matplotlib.pyplot as plt
 import numpy as np
 
 def evaluate_model(model, X_train, y_train, X_test, y_test, model_name: str = 'Model', ax=None, threshold: float = 0.5, plot: bool = True)-> dict:
@@ -32,6 +31,8 @@ def evaluate_model(model, X_train, y_train, X_test, y_test, model_name: str = 'M
         print(f"ALERT: Overfitting in {model_name} — PR-AUC gap: {gap*100:.2f}%")
     # Plot
     if plot:
+        import matplotlib.pyplot as plt  # deferred: serving code imports this package without plotting
+
         show = ax is None
         if show:
             _, ax = plt.subplots(figsize=(10, 6))
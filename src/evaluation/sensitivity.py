@@ -0,0 +1,38 @@
+# src/evaluation/sensitivity.py
+import numpy as np
+import pandas as pd
+from src.data.loader import to_model_input
+
+
+def axis_values(column: str, center: float, resolution: int = 100) -> np.ndarray:
+    """
+    Grid values for a what-if axis around the entered value.
+      amount         — log-spaced from center / 100 to center × 100
+      oldbalanceDest — 0 (empty destination, a strong signal) then log-spaced up to 100 × center
+      step           — every hour of the day (resolution ignored)
+    """
+    if column == 'step':
+        return np.arange(24)
+    center = max(float(center), 1.0)
+    if column == 'amount':
+        return np.geomspace(center / 100, center * 100, resolution)
+    if column == 'oldbalanceDest':
+        return np.concatenate([[0.0], np.geomspace(1.0, max(center, 1e4) * 100, resolution - 1)])
+    raise ValueError(f"No what-if axis defined for {column}")
+
+
+def build_grid(base: dict, x_col: str, x_values, y_col: str, y_values) -> pd.DataFrame:
+    """Raw rows: `base` repeated over the x × y mesh (row-major in y, then x)."""
+    xx, yy = np.meshgrid(np.asarray(x_values), np.asarray(y_values))
+    n      = xx.size
+    grid   = pd.DataFrame({k: np.repeat(v, n) for k, v in base.items()})
+    grid[x_col] = xx.ravel().astype(grid[x_col].dtype, copy=False)
+    grid[y_col] = yy.ravel().astype(grid[y_col].dtype, copy=False)
+    return grid
+
+
+def score_grid(model, base: dict, x_col: str, x_values, y_col: str, y_values) -> np.ndarray:
+    """Fraud probability over the mesh in one predict_proba call, shape (len(y), len(x))."""
+    grid  = build_grid(base, x_col, x_values, y_col, y_values)
+    proba = model.predict_proba(to_model_input(grid))[:, 1]
+    return proba.reshape(len(y_values), len(x_values))
@@ -0,0 +1,162 @@
+# src/features/cache.py
+"""
+Content-addressed cache of engineered train/test matrices.
+
+An entry is keyed on everything that determines the matrices the model is
+fitted on:
+
+  - the raw input file contents (hashed once per path/size/mtime)
+  - the source of the loading, splitting and feature modules (data.loader,
+    data.splitter, features.engineering, features.velocity)
+  - the configuration of the unfitted feature steps (`fe` params such as
+    cyclical_encoding / large_tx_quantile, the preprocessor's transformers)
+  - the feature lists and filtering rules in src/config.py
+  - the split settings (test_size, stratify, seed)
+
+Each entry stores the matrices as .npy files (loaded memory-mapped), the
+labels with their original index, the fitted feature steps and the raw test
+split, so a model-only iteration can go straight to `model.fit`. The cache
+evicts least-recently-used entries when it grows beyond `max_bytes`.
+"""
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from src import config
+from src.data import loader, splitter
+from src.features import engineering, velocity
+from src.utils.helpers import file_digest
+
+_FILES   = ('X_train.npy', 'X_test.npy', 'y_train.parquet', 'y_test.parquet', 'features.pkl', 'X_test_raw.parquet')
+_SOURCES = (loader, splitter, engineering, velocity)
+
+
+def _describe(step) -> object:
+    """JSON-able description of a (possibly nested) transformer's configuration."""
+    if hasattr(step, 'steps'):
+        return [[name, _describe(s)] for name, s in step.steps]
+    if hasattr(step, 'transformers'):
+        return [[name, _describe(t), list(cols) if not isinstance(cols, str) else cols]
+                for name, t, cols in step.transformers]
+    params = step.get_params(deep=False) if hasattr(step, 'get_params') else {}
+    simple = {k: v for k, v in params.items() if isinstance(v, (str, int, float, bool, type(None)))}
+    return [type(step).__name__, simple]
+
+
+class FeatureCache:
+
+    def __init__(self, root=None, max_bytes: int = 5 * 1024**3):
+        self.root      = Path(root or config.FEATURE_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # ── Keys ──────────────────────────────────────────────────────────────────
+
+    def data_digest(self, path) -> str:
+        """Content hash of `path`, memoised on (path, size, mtime) to avoid rehashing GBs."""
+        path  = Path(path).resolve()
+        stat  = path.stat()
+        index = self.root / '_data_digests.json'
+        known = json.loads(index.read_text()) if index.exists() else {}
+        stamp = f'{path}|{stat.st_size}|{stat.st_mtime_ns}'
+        if stamp not in known:
+            known[stamp] = file_digest(path)
+            index.write_text(json.dumps(known, indent=2))
+        return known[stamp]
+
+    def key(self, data_path, features, split: dict) -> str:
+        """Cache key for the unfitted feature steps `features` (pipeline[:-1])."""
+        signature = {
+            'data':        self.data_digest(data_path),
+            'engineering': hashlib.blake2b(
+                ''.join(inspect.getsource(m) for m in _SOURCES).encode(), digest_size=20
+            ).hexdigest(),
+            'features':    _describe(features),
+            'config': {
+                'FRAUD_TYPES':       config.FRAUD_TYPES,
+                'DROP_COLS':         config.DROP_COLS,
+                'NUMERIC_FEATURES':  config.NUMERIC_FEATURES,
+                'BINARY_FEATURES':   config.BINARY_FEATURES,
+                'CYCLICAL_FEATURES': config.CYCLICAL_FEATURES,
+                'VELOCITY_FEATURES': config.VELOCITY_FEATURES,
+            },
+            'split':       split,
+        }
+        blob = json.dumps(signature, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+    # ── Entries ───────────────────────────────────────────────────────────────
+
+    def load(self, key: str) -> dict | None:
+        """Matrices (memory-mapped), fitted feature steps and raw X_test, or None on a miss."""
+        entry = self.root / key
+        if not all((entry / name).exists() for name in ('meta.json', *_FILES)):
+            return None
+        meta = json.loads((entry / 'meta.json').read_text())
+        meta['last_used'] = time.time()
+        (entry / 'meta.json').write_text(json.dumps(meta, indent=2))
+
+        with open(entry / 'features.pkl', 'rb') as f:
+            features = pickle.load(f)
+        return {
+            'X_train':    np.load(entry / 'X_train.npy', mmap_mode='r'),
+            'X_test':     np.load(entry / 'X_test.npy', mmap_mode='r'),
+            'y_train':    pd.read_parquet(entry / 'y_train.parquet')[config.TARGET],
+            'y_test':     pd.read_parquet(entry / 'y_test.parquet')[config.TARGET],
+            'features':   features,
+            'X_test_raw': pd.read_parquet(entry / 'X_test_raw.parquet'),
+        }
+
+    def save(self, key: str, X_train, X_test, y_train, y_test, features, X_test_raw: pd.DataFrame) -> Path:
+        """Write an entry atomically (tmp dir + rename), then evict down to max_bytes."""
+        entry = self.root / key
+        tmp   = self.root / f'.{key}.{os.getpid()}.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+
+        np.save(tmp / 'X_train.npy', np.ascontiguousarray(X_train))
+        np.save(tmp / 'X_test.npy', np.ascontiguousarray(X_test))
+        # parquet keeps the index, so y_test stays aligned with X_test_raw on a hit
+        pd.Series(y_train, name=config.TARGET).to_frame().to_parquet(tmp / 'y_train.parquet')
+        pd.Series(y_test, name=config.TARGET).to_frame().to_parquet(tmp / 'y_test.parquet')
+        with open(tmp / 'features.pkl', 'wb') as f:
+            pickle.dump(features, f)
+        X_test_raw.to_parquet(tmp / 'X_test_raw.parquet')
+
+        size = sum((tmp / name).stat().st_size for name in _FILES)
+        now  = time.time()
+        (tmp / 'meta.json').write_text(json.dumps({'bytes': size, 'created': now, 'last_used': now}, indent=2))
+
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+        self.evict(keep=key)
+        return entry
+
+    def entries(self) -> list[dict]:
+        out = []
+        for meta_path in self.root.glob('*/meta.json'):
+            meta = json.loads(meta_path.read_text())
+            out.append({'key': meta_path.parent.name, **meta})
+        return out
+
+    def evict(self, keep: str | None = None) -> list[str]:
+        """Drop least-recently-used entries until the cache fits in max_bytes."""
+        entries = sorted(self.entries(), key=lambda e: e['last_used'])
+        total   = sum(e['bytes'] for e in entries)
+        evicted = []
+        for e in entries:
+            if total <= self.max_bytes:
+                break
+            if e['key'] == keep:
+                continue
+            shutil.rmtree(self.root / e['key'], ignore_errors=True)
+            total -= e['bytes']
+            evicted.append(e['key'])
+        return evicted
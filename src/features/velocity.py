@@ -0,0 +1,198 @@
+# src/features/velocity.py
+import threading
+from collections import OrderedDict, deque
+from sklearn.base import BaseEstimator, TransformerMixin
+import pandas as pd
+import numpy as np
+
+# (prefix, account column) — counts/amounts sent by nameOrig and received by nameDest
+_ENTITIES = [('orig', 'nameOrig'), ('dest', 'nameDest')]
+
+
+def velocity_feature_names(windows) -> list[str]:
+    return [
+        f'{prefix}_{stat}_{w}h'
+        for prefix, _ in _ENTITIES
+        for w in windows
+        for stat in ('count', 'amount')
+    ]
+
+
+def windowed_past(keys, steps, values, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    For every row, count and sum of `values` over rows with the same key and
+    step in [step - window, step) — strictly past, same-step rows excluded.
+
+    Rows are sorted once by (key, step) through a single composite int64 key;
+    both window bounds are then found with searchsorted and sums come from one
+    cumulative sum, so the whole computation is O(n log n) and fully vectorised.
+    """
+    codes = pd.factorize(keys)[0].astype('int64')
+    steps = np.asarray(steps, dtype='int64')
+    steps = steps - steps.min() if steps.size else steps
+    # span > max step + window keeps every window inside its own key's block
+    span  = (int(steps.max()) if steps.size else 0) + window + 1
+    comp  = codes * span + steps
+
+    order    = np.argsort(comp, kind='stable')
+    sorted_c = comp[order]
+    csum     = np.concatenate([[0.0], np.cumsum(np.asarray(values, dtype='float64')[order])])
+
+    hi = np.searchsorted(sorted_c, comp, side='left')           # rows strictly before this step
+    lo = np.searchsorted(sorted_c, comp - window, side='left')  # rows before the window opens
+    return (hi - lo).astype('float32'), (csum[hi] - csum[lo]).astype('float32')
+
+
+class VelocityFeatures(BaseEstimator, TransformerMixin):
+    """
+    Time-aware velocity signals per account over the last `windows` steps:
+    orig_count_{w}h / orig_amount_{w}h (sent by nameOrig) and
+    dest_count_{w}h / dest_amount_{w}h (received by nameDest).
+
+    The columns need history beyond any one batch, so the pipeline step only
+    checks that they are present and passes them through. They are filled
+    beforehand: offline by `compute` over the whole step-ordered stream
+    (train.py, compact.py), online by a VelocityStore.
+    """
+
+    def __init__(self, windows: tuple = (1, 24)):
+        self.windows = windows
+
+    def fit(self, X: pd.DataFrame, y=None):
+        self._check(X)
+        return self
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        self._check(X)
+        return X
+
+    def _check(self, X: pd.DataFrame) -> None:
+        missing = [c for c in velocity_feature_names(self.windows) if c not in X.columns]
+        if missing:
+            raise ValueError(
+                f'Velocity columns missing: {missing}. Fill them over the full transaction stream with '
+                f'VelocityFeatures.compute (offline) or a VelocityStore (online); computing them per '
+                f'batch would drop history at every batch boundary.'
+            )
+
+    def compute(self, X: pd.DataFrame) -> pd.DataFrame:
+        """Copy of X with the velocity columns computed from the rows of X (past-only, windowed_past)."""
+        X = X.copy()
+        for prefix, col in _ENTITIES:
+            for w in self.windows:
+                X[f'{prefix}_count_{w}h'], X[f'{prefix}_amount_{w}h'] = windowed_past(
+                    X[col].to_numpy(), X['step'].to_numpy(), X['amount'].to_numpy(), w
+                )
+        return X
+
+
+def velocity_step(model) -> VelocityFeatures | None:
+    """The VelocityFeatures step of a fitted pipeline, or None."""
+    return getattr(model, 'named_steps', {}).get('velocity')
+
+
+def with_fresh_history(model, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fill velocity columns for throwaway rows (warm-up) from a new, empty store,
+    so they never touch the serving history. A no-op for non-velocity models.
+    """
+    step = velocity_step(model)
+    return df if step is None else VelocityStore(windows=step.windows).enrich(df)
+
+
+class VelocityStore:
+    """
+    Online side of VelocityFeatures: bounded per-account ring buffers of
+    (step, amount). Least-recently-seen accounts are evicted beyond
+    `max_accounts`; accounts with more than `maxlen` transactions inside the
+    longest window saturate at `maxlen`.
+
+    Every enriched row is recorded, whatever its type — training computes the
+    features on the raw stream before filter_and_clean for the same reason.
+    """
+
+    def __init__(self, windows: tuple = (1, 24), maxlen: int = 64, max_accounts: int = 1_000_000):
+        self.windows      = tuple(windows)
+        self.maxlen       = maxlen
+        self.max_accounts = max_accounts
+        self._buffers     = {prefix: OrderedDict() for prefix, _ in _ENTITIES}
+        self._lock        = threading.Lock()
+
+    def _buffer(self, prefix: str, account: str) -> deque:
+        buffers = self._buffers[prefix]
+        buf = buffers.get(account)
+        if buf is None:
+            buf = buffers[account] = deque(maxlen=self.maxlen)
+            if len(buffers) > self.max_accounts:
+                buffers.popitem(last=False)
+        else:
+            buffers.move_to_end(account)
+        return buf
+
+    def lookup(self, row: dict) -> dict:
+        """Velocity features for one raw transaction, from strictly earlier steps."""
+        step, out = int(row['step']), {}
+        for prefix, col in _ENTITIES:
+            buf = self._buffers[prefix].get(row[col], ())
+            for w in self.windows:
+                hits = [amount for s, amount in buf if step - w <= s < step]
+                out[f'{prefix}_count_{w}h']  = float(len(hits))
+                out[f'{prefix}_amount_{w}h'] = float(sum(hits))
+        return out
+
+    def record(self, row: dict) -> None:
+        for prefix, col in _ENTITIES:
+            self._buffer(prefix, row[col]).append((int(row['step']), float(row['amount'])))
+
+    def enrich(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add velocity columns to raw rows, then record them. A single row is
+        looked up directly; a batch is scored in one windowed_past pass over
+        the buffered history of its accounts plus its own rows, so rows of the
+        same request count for each other exactly as in training.
+        """
+        df = df.reset_index(drop=True)
+        with self._lock:
+            if len(df) == 1:
+                row   = {c: df[c].iat[0] for c in ('step', 'amount', 'nameOrig', 'nameDest')}
+                feats = {name: np.array([v], dtype='float32') for name, v in self.lookup(row).items()}
+                self.record(row)
+            else:
+                steps, amounts = df['step'].to_numpy('int64'), df['amount'].to_numpy('float64')
+                feats = {}
+                for prefix, col in _ENTITIES:
+                    feats.update(self._enrich_entity(prefix, df[col].to_numpy(dtype=object), steps, amounts))
+        return pd.concat([df, pd.DataFrame(feats, copy=False)], axis=1)
+
+    def _enrich_entity(self, prefix: str, keys, steps, amounts) -> dict:
+        codes, accounts = pd.factorize(keys)
+        buffers = self._buffers[prefix]
+
+        hist_codes, hist_rows = [], []
+        for code, account in enumerate(accounts.tolist()):
+            buf = buffers.get(account)
+            if buf:
+                hist_codes += [code] * len(buf)
+                hist_rows  += buf
+        hist = np.array(hist_rows, dtype='float64').reshape(-1, 2)
+        n    = len(hist)
+
+        all_codes   = np.concatenate([np.array(hist_codes, dtype=codes.dtype), codes])
+        all_steps   = np.concatenate([hist[:, 0].astype('int64'), steps])
+        all_amounts = np.concatenate([hist[:, 1], amounts])
+        out = {}
+        for w in self.windows:
+            count, total = windowed_past(all_codes, all_steps, all_amounts, w)
+            out[f'{prefix}_count_{w}h'], out[f'{prefix}_amount_{w}h'] = count[n:], total[n:]
+
+        # record in arrival order (_buffer inlined: this loop runs once per row)
+        for account, step, amount in zip(keys.tolist(), steps.tolist(), amounts.tolist()):
+            buf = buffers.get(account)
+            if buf is None:
+                buf = buffers[account] = deque(maxlen=self.maxlen)
+            else:
+                buffers.move_to_end(account)
+            buf.append((step, amount))
+        while len(buffers) > self.max_accounts:
+            buffers.popitem(last=False)
+        return out
@@ -8,12 +8,14 @@ from sklearn.ensemble import RandomForestClassifier
 from xgboost import XGBClassifier
 
 from src.features.engineering import PaySimFeatures
-from src.config import BINARY_FEATURES, NUMERIC_FEATURES, RANDOM_SEED
+from src.features.velocity import VelocityFeatures
+from src.config import BINARY_FEATURES, NUMERIC_FEATURES, RANDOM_SEED, VELOCITY_FEATURES, VELOCITY_WINDOWS
 
 
-def build_pipeline(model_name: str = 'xgb', params: dict = None) -> Pipeline:
+def build_pipeline(model_name: str = 'xgb', params: dict = None, velocity: bool = False) -> Pipeline:
     params   = params or {}
     is_logreg = (model_name == 'logreg')
+    numeric   = NUMERIC_FEATURES + (VELOCITY_FEATURES if velocity else [])
 
     num_steps = [('impute', SimpleImputer(strategy='median'))]
     if is_logreg:
@@ -22,7 +24,7 @@ def build_pipeline(model_name: str = 'xgb', params: dict = None) -> Pipeline:
     preprocessor = ColumnTransformer(
         transformers=[
             ('bool', SimpleImputer(strategy='most_frequent'), BINARY_FEATURES),
-            ('num', Pipeline(num_steps), NUMERIC_FEATURES),
+            ('num', Pipeline(num_steps), numeric),
         ],
         remainder='drop'
     )
@@ -43,7 +45,8 @@ def build_pipeline(model_name: str = 'xgb', params: dict = None) -> Pipeline:
     else:
         raise ValueError(f"Model {model_name} not supported.")
 
-    return Pipeline([
+    steps = [('velocity', VelocityFeatures(windows=tuple(VELOCITY_WINDOWS)))] if velocity else []
+    return Pipeline(steps + [
         ('fe',           PaySimFeatures(cyclical_encoding=is_logreg)),
         ('preprocessor', preprocessor),
         ('model',        model),
@@ -0,0 +1,151 @@
+# src/models/cascade.py
+import threading
+import numpy as np
+import pandas as pd
+from src.config import FRAUD_TYPES
+
+STAGES = ('rule', 'light', 'full')
+
+
+class CascadeScorer:
+    """
+    Tiered scorer with the same predict_proba contract as a fitted Pipeline.
+
+      rule  — types outside `in_scope_types` (never seen in training) → 0.0
+      light — cheap model (e.g. build_pipeline('logreg')); its score is returned
+              as-is when it falls below `low` (clearly benign) or at/above `high`
+      full  — the full model, only for the ambiguous band low <= light < high
+
+    `low` must not exceed the operating threshold and `high` must not be below
+    it, so rows resolved by the light model never change side of the threshold
+    because of the shortcut. Use `calibrate_bands` to choose them.
+    """
+
+    def __init__(self, light, full, threshold: float, low: float = 0.0, high: float = np.inf,
+                 in_scope_types: list[str] = FRAUD_TYPES):
+        if not low <= threshold <= high:
+            raise ValueError(f"Bands must satisfy low <= threshold <= high, got {low}, {threshold}, {high}")
+        self.light          = light
+        self.full           = full
+        self.threshold      = threshold
+        self.low            = low
+        self.high           = high
+        self.in_scope_types = list(in_scope_types)
+        self._lock          = threading.Lock()
+        self.counters       = dict.fromkeys(STAGES, 0)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def reset_counters(self):
+        with self._lock:
+            self.counters = dict.fromkeys(STAGES, 0)
+
+    def add_counts(self, hits: dict):
+        """Merge stage hits counted elsewhere (e.g. by copies in worker processes)."""
+        with self._lock:
+            for name, n in hits.items():
+                self.counters[name] += int(n)
+
+    def route(self, X: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        """Score X and return (probabilities, stage index per row into STAGES)."""
+        proba = np.zeros(len(X), dtype='float64')
+        stage = np.zeros(len(X), dtype='int8')
+
+        in_scope = np.flatnonzero(X['type'].isin(self.in_scope_types).to_numpy(dtype=bool))
+        if in_scope.size:
+            p_light = self.light.predict_proba(X.iloc[in_scope])[:, 1]
+            proba[in_scope] = p_light
+            stage[in_scope] = 1
+
+            ambiguous = in_scope[(p_light >= self.low) & (p_light < self.high)]
+            if ambiguous.size:
+                proba[ambiguous] = self.full.predict_proba(X.iloc[ambiguous])[:, 1]
+                stage[ambiguous] = 2
+
+        hits = np.bincount(stage, minlength=len(STAGES))
+        with self._lock:
+            for name, n in zip(STAGES, hits):
+                self.counters[name] += int(n)
+        return proba, stage
+
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        proba, _ = self.route(X)
+        return np.column_stack([1 - proba, proba])
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        return (self.predict_proba(X)[:, 1] >= self.threshold).astype(int)
+
+
+def calibrate_bands(light, full, X: pd.DataFrame, y: pd.Series, threshold: float,
+                    max_recall_loss: float = 0.005, min_high_agreement: float | None = None,
+                    in_scope_types: list[str] = FRAUD_TYPES) -> dict:
+    """
+    Choose the light-model band on a held-out labelled set.
+
+    low  — largest light score such that the frauds the full model catches at
+           `threshold` but the light model would clear (light < low) cost at
+           most `max_recall_loss` of total recall. Capped at `threshold`.
+    high — smallest light score >= threshold above which the full model agrees
+           (also flags) on at least `min_high_agreement` of rows. None → disabled.
+    """
+    mask    = X['type'].isin(in_scope_types).to_numpy(dtype=bool)
+    y       = np.asarray(y)
+    Xs, ys  = X[mask], y[mask]
+    p_light = light.predict_proba(Xs)[:, 1]
+    p_full  = full.predict_proba(Xs)[:, 1]
+    caught  = (ys == 1) & (p_full >= threshold)
+
+    # recall lost if every caught fraud with light score < low is cleared early
+    order  = np.sort(p_light[caught])
+    budget = int(np.floor(max_recall_loss * max(int((y == 1).sum()), 1)))
+    low    = order[budget] if budget < order.size else threshold
+    low    = float(min(low, threshold))
+
+    high = np.inf
+    if min_high_agreement is not None:
+        above   = p_light >= threshold
+        order   = np.argsort(p_light[above])
+        scores  = p_light[above][order]
+        flagged = (p_full[above] >= threshold)[order]
+        # agreement of the full model over every suffix scores[i:]
+        agreement = np.cumsum(flagged[::-1])[::-1] / np.arange(scores.size, 0, -1)
+        ok = np.flatnonzero(agreement >= min_high_agreement)
+        if ok.size:
+            high = float(scores[ok[0]])
+
+    return {'low': low, 'high': high}
+
+
+def recall_loss_report(cascade: CascadeScorer, X: pd.DataFrame, y: pd.Series) -> dict:
+    """Compare the cascade to its full model alone at the cascade's threshold."""
+    y      = np.asarray(y)
+    p_full = cascade.full.predict_proba(X)[:, 1]
+    p_cas, stage = cascade.route(X)
+
+    def _scores(proba):
+        pred = proba >= cascade.threshold
+        tp   = int((pred & (y == 1)).sum())
+        return {
+            'recall':    tp / max(int((y == 1).sum()), 1),
+            'precision': tp / max(int(pred.sum()), 1),
+            'flagged':   int(pred.sum()),
+        }
+
+    full, cas = _scores(p_full), _scores(p_cas)
+    shares    = np.bincount(stage, minlength=len(STAGES)) / max(len(stage), 1)
+    return {
+        'full':             full,
+        'cascade':          cas,
+        'recall_loss':      full['recall'] - cas['recall'],
+        'stage_share':      dict(zip(STAGES, shares.round(4).tolist())),
+        'full_model_calls': int((stage == 2).sum()),
+        'rows':             len(stage),
+        'bands':            {'low': cascade.low, 'high': cascade.high},
+    }
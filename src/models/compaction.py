@@ -0,0 +1,204 @@
+# src/models/compaction.py
+"""
+Latency-budgeted model compaction.
+
+Starting from a fitted `build_pipeline('xgb')` (the teacher), builds smaller
+variants, measures each one's latency and quality, and picks the best variant
+that fits a latency budget. Latency is measured with every variant pinned to
+the serving thread count (`api.executor.threads_per_worker`), not n_jobs=-1:
+
+  truncate  — first k boosting rounds of the teacher (no retraining)
+  depth     — retrained with a lower max_depth / fewer rounds
+  distill   — small XGBoost regressor fitted on the teacher's scores, reusing
+              the teacher's fitted feature steps
+"""
+import copy
+import time
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.metrics import average_precision_score
+from sklearn.pipeline import Pipeline
+from xgboost import XGBRegressor
+
+from src.features.velocity import velocity_step
+from src.models.builder import build_pipeline
+from src.scoring.bulk import pin_threads
+from src.config import RANDOM_SEED
+
+
+class DistilledClassifier(BaseEstimator, ClassifierMixin):
+    """Student regressor on teacher probabilities, exposed as a classifier."""
+
+    def __init__(self, max_depth: int = 3, n_estimators: int = 50, learning_rate: float = 0.3, n_jobs: int = -1):
+        self.max_depth     = max_depth
+        self.n_estimators  = n_estimators
+        self.learning_rate = learning_rate
+        self.n_jobs        = n_jobs
+
+    def fit(self, X, y_soft):
+        self.regressor_ = XGBRegressor(
+            objective='reg:logistic',
+            max_depth=self.max_depth,
+            n_estimators=self.n_estimators,
+            learning_rate=self.learning_rate,
+            tree_method='hist',
+            random_state=RANDOM_SEED,
+            n_jobs=self.n_jobs,
+        ).fit(X, y_soft)
+        self.classes_ = np.array([0, 1])
+        return self
+
+    def set_params(self, **params):
+        # keep the fitted regressor in step, so pin_threads applies to scoring
+        super().set_params(**params)
+        if 'n_jobs' in params and hasattr(self, 'regressor_'):
+            self.regressor_.set_params(n_jobs=self.n_jobs)
+        return self
+
+    def predict_proba(self, X) -> np.ndarray:
+        p = np.clip(self.regressor_.predict(X), 0.0, 1.0)
+        return np.column_stack([1 - p, p])
+
+    def predict(self, X) -> np.ndarray:
+        return (self.predict_proba(X)[:, 1] >= 0.5).astype(int)
+
+
+# ── Variants ──────────────────────────────────────────────────────────────────
+
+def truncate_rounds(pipeline: Pipeline, n_rounds: int) -> Pipeline:
+    """Copy of `pipeline` whose XGBoost model keeps only its first `n_rounds` trees."""
+    model = pipeline.named_steps['model']
+    if not hasattr(model, 'get_booster'):
+        raise ValueError(f"Round truncation needs an XGBoost model, got {type(model).__name__}")
+    booster = model.get_booster()
+    if n_rounds >= booster.num_boosted_rounds():
+        return pipeline
+
+    compact = copy.deepcopy(pipeline)
+    compact.named_steps['model']._Booster     = booster[:n_rounds]
+    compact.named_steps['model'].n_estimators = n_rounds
+    return compact
+
+
+def retrain_smaller(X_train, y_train, max_depth: int, n_estimators: int, velocity: bool = False) -> Pipeline:
+    params = {'max_depth': max_depth, 'n_estimators': n_estimators}
+    return build_pipeline('xgb', params=params, velocity=velocity).fit(X_train, y_train)
+
+
+def distill(teacher: Pipeline, X_train, max_depth: int, n_estimators: int) -> Pipeline:
+    """Student pipeline: teacher's fitted feature steps + DistilledClassifier on its scores."""
+    features = teacher[:-1]
+    Z        = features.transform(X_train)
+    y_soft   = teacher.named_steps['model'].predict_proba(Z)[:, 1]
+    student  = DistilledClassifier(max_depth=max_depth, n_estimators=n_estimators).fit(Z, y_soft)
+    return Pipeline([*copy.deepcopy(features.steps), ('model', student)])
+
+
+# ── Measurement ───────────────────────────────────────────────────────────────
+
+def measure_latency(model, X: pd.DataFrame, n_single: int = 200, batch_size: int = 10_000,
+                    n_threads: int | None = 1) -> dict:
+    """
+    Median single-row latency (ms) and amortised batch cost (µs / row), with the
+    model and BLAS pinned to `n_threads` as the API executor does (None: unpinned).
+    """
+    if n_threads is None:
+        return _measure_latency(model, X, n_single, batch_size)
+    from threadpoolctl import threadpool_limits
+
+    pin_threads(model, n_threads)
+    with threadpool_limits(limits=n_threads):
+        return _measure_latency(model, X, n_single, batch_size)
+
+
+def _measure_latency(model, X: pd.DataFrame, n_single: int, batch_size: int) -> dict:
+    rng  = np.random.default_rng(RANDOM_SEED)
+    rows = rng.integers(0, len(X), size=n_single)
+    model.predict_proba(X.iloc[:1])  # warm-up
+
+    single = []
+    for i in rows:
+        row = X.iloc[[i]]
+        t0  = time.perf_counter()
+        model.predict_proba(row)
+        single.append(time.perf_counter() - t0)
+
+    batch = X.iloc[:batch_size]
+    t0    = time.perf_counter()
+    model.predict_proba(batch)
+    batch_s = time.perf_counter() - t0
+
+    return {
+        'single_p50_ms':    float(np.median(single) * 1e3),
+        'single_p95_ms':    float(np.percentile(single, 95) * 1e3),
+        'batch_us_per_row': batch_s / len(batch) * 1e6,
+    }
+
+
+def evaluate_variant(model, X_test, y_test, threshold: float, **latency_kwargs) -> dict:
+    y_prob = model.predict_proba(X_test)[:, 1]
+    y_pred = y_prob >= threshold
+    y_true = np.asarray(y_test) == 1
+    tp     = int((y_pred & y_true).sum())
+    return {
+        'pr_auc':    average_precision_score(y_true, y_prob),
+        'recall':    tp / max(int(y_true.sum()), 1),
+        'precision': tp / max(int(y_pred.sum()), 1),
+        **measure_latency(model, X_test, **latency_kwargs),
+    }
+
+
+def pareto_front(table: pd.DataFrame, latency: str = 'single_p50_ms', quality: str = 'pr_auc') -> pd.Series:
+    """True for variants no other variant beats on both latency (lower) and quality (higher)."""
+    lat, qual = table[latency].to_numpy(), table[quality].to_numpy()
+    dominated = (
+        (lat[None, :] <= lat[:, None]) & (qual[None, :] >= qual[:, None])
+        & ((lat[None, :] < lat[:, None]) | (qual[None, :] > qual[:, None]))
+    ).any(axis=1)
+    return pd.Series(~dominated, index=table.index)
+
+
+# ── Search ────────────────────────────────────────────────────────────────────
+
+def compact_search(
+    teacher: Pipeline,
+    X_train, y_train, X_test, y_test,
+    threshold: float,
+    rounds: list[int] = (25, 50, 75),
+    depths: list[tuple[int, int]] = ((3, 100), (4, 50), (2, 100)),
+    distill_shapes: list[tuple[int, int]] = ((3, 50), (4, 100)),
+    **latency_kwargs,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Build and evaluate every variant. Returns (table, {name: fitted pipeline}).
+    `depths` / `distill_shapes` are (max_depth, n_estimators) pairs.
+    """
+    velocity = velocity_step(teacher) is not None  # keep the teacher's feature set
+    variants = {'teacher': teacher}
+    for k in rounds:
+        variants[f'truncate_{k}'] = truncate_rounds(teacher, k)
+    for depth, n in depths:
+        variants[f'depth{depth}_n{n}'] = retrain_smaller(X_train, y_train, depth, n, velocity=velocity)
+    for depth, n in distill_shapes:
+        variants[f'distill_depth{depth}_n{n}'] = distill(teacher, X_train, depth, n)
+
+    rows = [
+        {'variant': name, **evaluate_variant(model, X_test, y_test, threshold, **latency_kwargs)}
+        for name, model in variants.items()
+    ]
+    table = pd.DataFrame(rows).set_index('variant')
+    table['pareto'] = pareto_front(table)
+    return table, variants
+
+
+def choose_variant(table: pd.DataFrame, budget: float, latency: str = 'single_p50_ms',
+                   min_recall: float = 0.0) -> str:
+    """Highest PR-AUC variant within the latency budget (and recall floor)."""
+    eligible = table[(table[latency] <= budget) & (table['recall'] >= min_recall)]
+    if eligible.empty:
+        raise ValueError(
+            f"No variant meets {latency} <= {budget} with recall >= {min_recall}. "
+            f"Fastest: {table[latency].idxmin()} at {table[latency].min():.3f}"
+        )
+    return eligible['pr_auc'].idxmax()
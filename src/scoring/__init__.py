@@ -0,0 +1,2 @@
+from .bulk import score_file
+from .stream import RiskSummary
@@ -0,0 +1,258 @@
+# src/scoring/bulk.py
+"""
+Offline bulk scoring of PaySim-format CSV / Parquet files.
+
+The input is read in fixed-size chunks by the parent process and fanned out to
+a process pool; every worker unpickles the pipeline once (pool initializer)
+and writes its chunk to `<output>.parts/part-<index>.parquet`. Completed parts
+are skipped on restart, so an interrupted run resumes where it stopped. Once
+every chunk is done the parts are streamed, in order, into the single output
+file.
+
+Memory is bounded by chunk_rows × (workers + max_pending): the parent never
+reads ahead of `max_pending` chunks beyond the ones being scored.
+
+Velocity pipelines (train.py --velocity) need their velocity columns already
+in the input, computed over the whole step-ordered stream
+(VelocityFeatures.compute): a chunk alone does not carry the history.
+"""
+import json
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import pandas as pd
+from src.config import RAW_FEATURES, VELOCITY_FEATURES
+from src.data.loader import _DTYPES, to_model_input
+from src.utils.helpers import file_digest
+
+log = logging.getLogger(__name__)
+
+_MODEL = None  # per-worker pipeline, set by _init_worker
+
+
+# ── Input ─────────────────────────────────────────────────────────────────────
+
+def iter_chunks(source, chunk_rows: int, columns: list[str]):
+    """
+    Yield DataFrames of at most `chunk_rows` rows with only `columns` loaded.
+    `source` is a .csv / .parquet path or a file-like object holding CSV.
+    """
+    if isinstance(source, (str, os.PathLike)) and Path(source).suffix == '.parquet':
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+    else:
+        dtypes = {c: t for c, t in _DTYPES.items() if c in columns}
+        yield from pd.read_csv(source, usecols=columns, dtype=dtypes, chunksize=chunk_rows)
+
+
+def input_columns(source) -> list[str]:
+    """Column names of a .csv / .parquet file without reading its rows."""
+    if Path(source).suffix == '.parquet':
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(source).schema_arrow.names
+    return pd.read_csv(source, nrows=0).columns.tolist()
+
+
+# ── Workers ───────────────────────────────────────────────────────────────────
+
+def pin_threads(model, n_threads: int | None):
+    """Set n_jobs on every estimator that has one (pipelines and cascade stages)."""
+    if n_threads is None:
+        return model
+    if hasattr(model, 'light') and hasattr(model, 'full'):
+        pin_threads(model.light, n_threads)
+        pin_threads(model.full, n_threads)
+        return model
+    estimator = model.steps[-1][1] if hasattr(model, 'steps') else model
+    if hasattr(estimator, 'get_params') and 'n_jobs' in estimator.get_params():
+        estimator.set_params(n_jobs=n_threads)
+    return model
+
+
+def load_model(model_path, n_threads: int | None = 1):
+    """Unpickle the pipeline, pinning the estimator's thread count if it has one."""
+    import joblib
+
+    return pin_threads(joblib.load(model_path), n_threads)
+
+
+def _init_worker(model_path, n_threads):
+    global _MODEL
+    _MODEL = load_model(model_path, n_threads)
+
+
+def predict_chunk(chunk: pd.DataFrame):
+    """Fraud probabilities for raw rows with this worker's pipeline."""
+    return _MODEL.predict_proba(to_model_input(chunk))[:, 1]
+
+
+def predict_chunk_counted(chunk: pd.DataFrame):
+    """predict_chunk plus the cascade stage hits it caused (None for plain pipelines)."""
+    proba = predict_chunk(chunk)
+    if not hasattr(_MODEL, 'reset_counters'):
+        return proba, None
+    hits = dict(_MODEL.counters)
+    _MODEL.reset_counters()
+    return proba, hits
+
+
+def _score_chunk(index: int, offset: int, chunk: pd.DataFrame, threshold: float,
+                 keep_columns: list[str], parts_dir: str) -> int:
+    proba = predict_chunk(chunk)
+    out = pd.DataFrame({'row': pd.RangeIndex(offset, offset + len(chunk), dtype='int64')})
+    for col in keep_columns:
+        out[col] = chunk[col].to_numpy()
+    out['fraud_probability'] = proba.astype('float32')
+    out['is_fraud']          = proba >= threshold
+
+    # write-then-rename so a killed worker never leaves a half-written part behind
+    final = Path(parts_dir) / f'part-{index:06d}.parquet'
+    tmp   = final.with_suffix('.tmp')
+    out.to_parquet(tmp, index=False)
+    os.replace(tmp, final)
+    return len(chunk)
+
+
+# ── Driver ────────────────────────────────────────────────────────────────────
+
+def _check_velocity(model_path, header: list[str]) -> None:
+    """Refuse a velocity pipeline on input whose velocity columns are not precomputed."""
+    from src.features.velocity import velocity_feature_names, velocity_step
+
+    step = velocity_step(load_model(model_path, None))
+    if step is None:
+        return
+    missing = [c for c in velocity_feature_names(step.windows) if c not in header]
+    if missing:
+        raise ValueError(
+            f'{model_path} is a velocity pipeline but the input lacks {missing}. Chunked scoring '
+            f'cannot see history across chunks; add them with VelocityFeatures.compute over the '
+            f'full step-ordered stream first.'
+        )
+
+
+def _check_manifest(parts_dir: Path, manifest: dict) -> None:
+    """Refuse to resume parts produced from a different input / model (path or contents) / chunking."""
+    path = parts_dir / '_manifest.json'
+    if path.exists():
+        previous = json.loads(path.read_text())
+        if previous != manifest:
+            raise ValueError(
+                f'{parts_dir} was produced by a different run: {previous}. '
+                f'Delete it or rerun with the same input, model and chunk size.'
+            )
+    else:
+        path.write_text(json.dumps(manifest, indent=2))
+
+
+def _merge_parts(parts_dir: Path, output: Path) -> None:
+    import pyarrow.parquet as pq
+
+    parts  = sorted(parts_dir.glob('part-*.parquet'))
+    tmp    = output.with_suffix('.tmp')
+    writer = None
+    try:
+        for part in parts:
+            table = pq.read_table(part)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is not None:
+        os.replace(tmp, output)
+
+
+def score_file(
+    input_path,
+    output_path,
+    model_path,
+    threshold: float,
+    chunk_rows: int = 250_000,
+    workers: int | None = None,
+    threads_per_worker: int = 1,
+    max_pending: int | None = None,
+    keep_columns: list[str] | None = None,
+    merge: bool = True,
+) -> dict:
+    """
+    Score `input_path` chunk by chunk on a process pool and write `output_path`.
+
+    Returns a summary with rows scored, chunks skipped on resume and throughput.
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    workers      = workers or os.cpu_count() or 1
+    max_pending  = max_pending or workers
+    keep_columns = list(keep_columns or [])
+    header       = input_columns(input_path)
+    _check_velocity(model_path, header)
+    velocity     = [c for c in VELOCITY_FEATURES if c in header]
+    columns      = list(dict.fromkeys(RAW_FEATURES + velocity + keep_columns))
+
+    parts_dir = output_path.with_name(output_path.name + '.parts')
+    parts_dir.mkdir(parents=True, exist_ok=True)
+    stat = input_path.stat()
+    _check_manifest(parts_dir, {
+        'input':        str(input_path.resolve()),
+        'input_size':   stat.st_size,
+        'input_mtime':  stat.st_mtime,
+        'model':        str(Path(model_path).resolve()),
+        'model_digest': file_digest(model_path),  # the default path is reused by every retrain
+        'chunk_rows':   chunk_rows,
+        'threshold':    threshold,
+        'keep_columns': keep_columns,
+    })
+    done = {int(p.stem.split('-')[1]) for p in parts_dir.glob('part-*.parquet')}
+
+    start, rows_scored, skipped, offset = time.perf_counter(), 0, 0, 0
+    pending = set()
+
+    def _drain(block_until: int):
+        nonlocal rows_scored
+        while len(pending) > block_until:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                pending.discard(fut)
+                rows_scored += fut.result()
+            elapsed = time.perf_counter() - start
+            log.info(f'{rows_scored:,} rows scored | {rows_scored / elapsed:,.0f} rows/s')
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(str(model_path), threads_per_worker),
+    ) as pool:
+        for index, chunk in enumerate(iter_chunks(input_path, chunk_rows, columns)):
+            if index in done:
+                skipped += 1
+            else:
+                pending.add(pool.submit(
+                    _score_chunk, index, offset, chunk, threshold, keep_columns, str(parts_dir)
+                ))
+                _drain(block_until=workers + max_pending - 1)
+            offset += len(chunk)
+        _drain(block_until=0)
+
+    elapsed = time.perf_counter() - start
+    if merge:
+        _merge_parts(parts_dir, output_path)
+        shutil.rmtree(parts_dir)
+
+    summary = {
+        'rows_total':     offset,
+        'rows_scored':    rows_scored,
+        'chunks_skipped': skipped,
+        'seconds':        round(elapsed, 2),
+        'rows_per_s':     round(rows_scored / elapsed) if elapsed else None,
+        'output':         str(output_path if merge else parts_dir),
+    }
+    log.info(f'Done: {summary}')
+    return summary
@@ -0,0 +1,35 @@
+# src/scoring/stream.py
+import numpy as np
+import pandas as pd
+
+
+class RiskSummary:
+    """
+    Running summary of chunk-by-chunk scores with bounded memory:
+    the `top_k` riskiest rows so far and a fixed-bin probability histogram.
+    """
+
+    def __init__(self, threshold: float, top_k: int = 500, bins: int = 50):
+        self.threshold = threshold
+        self.top_k     = top_k
+        self.edges     = np.linspace(0.0, 1.0, bins + 1)
+        self.counts    = np.zeros(bins, dtype='int64')
+        self.top       = None
+        self.rows      = 0
+        self.flagged   = 0
+
+    def update(self, scored: pd.DataFrame) -> None:
+        """`scored` is a chunk with a fraud_probability column."""
+        proba = scored['fraud_probability'].to_numpy()
+        self.counts  += np.histogram(proba, bins=self.edges)[0]
+        self.rows    += len(scored)
+        self.flagged += int((proba >= self.threshold).sum())
+
+        candidates = scored.nlargest(self.top_k, 'fraud_probability')
+        if self.top is not None:
+            candidates = pd.concat([self.top, candidates]).nlargest(self.top_k, 'fraud_probability')
+        self.top = candidates
+
+    def histogram(self) -> pd.DataFrame:
+        """Row counts per probability bin, indexed by the bin's lower edge."""
+        return pd.DataFrame({'rows': self.counts}, index=pd.Index(self.edges[:-1].round(2), name='fraud_probability'))
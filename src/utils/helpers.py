@@ -1,3 +1,4 @@
+import hashlib
 import numpy as np
 
 def sanitize_dict(obj):
@@ -16,3 +17,12 @@ def sanitize_dict(obj):
         return sanitize_dict(obj.to_dict())
     else:
         return obj
+
+
+def file_digest(path, chunk_bytes: int = 1 << 24) -> str:
+    """blake2b of a file's contents, streamed in 16 MB chunks."""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_bytes):
+            h.update(chunk)
+    return h.hexdigest()
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+from src.data.loader import synthetic_transactions, to_model_input
+from src.models.builder import build_pipeline
+
+
+# ── Fixture: small fitted pipeline ────────────────────────────────────────────
+# Trained on synthetic rows so tests never depend on the LFS model artifact.
+
+@pytest.fixture(scope="session")
+def train_df():
+    """Synthetic raw rows with a label loosely tied to the empty-destination signal."""
+    X   = to_model_input(synthetic_transactions(2000, seed=1))
+    rng = np.random.default_rng(1)
+    y   = ((X["oldbalanceDest"] == 0) & (rng.random(len(X)) < 0.3)).astype("uint8")
+    return X, y
+
+
+@pytest.fixture(scope="session")
+def fitted_pipeline(train_df):
+    X, y = train_df
+    return build_pipeline("xgb", params={"n_estimators": 20, "max_depth": 3}).fit(X, y)
@@ -0,0 +1,142 @@
+import pytest
+from fastapi.testclient import TestClient
+from api.main import app, server
+
+
+@pytest.fixture
+def client(fitted_pipeline):
+    """API client with the synthetic pipeline injected (startup hook not run)."""
+    server.model   = fitted_pipeline
+    server.is_warm = False
+    yield TestClient(app)
+    server.model   = None
+    server.is_warm = False
+
+
+# ── Test 1: /health is not ready until warm-up has run ────────────────────────
+def test_health_reports_ready_only_after_warmup(client):
+    assert client.get("/health").status_code == 503
+
+    server.warmup(batch_rows=8, runs=2)
+    server.is_warm = True
+
+    body = client.get("/health").json()
+    assert body["status"] == "ok"
+    assert body["is_warm"] is True
+
+
+# ── Test 2: /predict scores a single transaction ──────────────────────────────
+def test_predict_returns_probability(client):
+    payload = {
+        "step": 10, "type": "TRANSFER", "amount": 50000.0,
+        "nameOrig": "C123456789", "oldbalanceOrg": 50000.0,
+        "nameDest": "C987654321", "oldbalanceDest": 0.0,
+    }
+    body = client.post("/predict", json=payload).json()
+    assert 0.0 <= body["fraud_probability"] <= 1.0
+    assert body["is_fraud"] == (body["fraud_probability"] >= server.threshold)
+
+
+# ── Test 3: /predict/batch round-trips Arrow and MessagePack ──────────────────
+def _raw_columns(n=50):
+    from src.data.loader import synthetic_transactions
+    return synthetic_transactions(n, seed=3)
+
+
+def test_predict_batch_arrow_matches_pipeline(client, fitted_pipeline):
+    import numpy as np
+    import pyarrow as pa
+    from api.columnar import ARROW_STREAM
+    from src.data.loader import to_model_input
+
+    df   = _raw_columns()
+    sink = pa.BufferOutputStream()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    resp = client.post("/predict/batch", content=sink.getvalue().to_pybytes(),
+                       headers={"content-type": ARROW_STREAM})
+    assert resp.status_code == 200
+    out = pa.ipc.open_stream(resp.content).read_all()
+
+    expected = fitted_pipeline.predict_proba(to_model_input(df))[:, 1]
+    np.testing.assert_allclose(out.column("fraud_probability").to_numpy(), expected, rtol=1e-6)
+
+
+def test_predict_batch_msgpack_rejects_invalid_rows(client):
+    import msgpack
+    import numpy as np
+    from api.columnar import MSGPACK
+
+    df = _raw_columns()
+    df.loc[[2, 7], "amount"] = -1.0
+    payload = {
+        "step":           df["step"].to_numpy("<i4").tobytes(),
+        "amount":         df["amount"].to_numpy("<f8").tobytes(),
+        "oldbalanceOrg":  df["oldbalanceOrg"].to_numpy("<f8").tobytes(),
+        "oldbalanceDest": df["oldbalanceDest"].to_numpy("<f8").tobytes(),
+        "type":           df["type"].tolist(),
+        "nameOrig":       df["nameOrig"].tolist(),
+        "nameDest":       df["nameDest"].tolist(),
+    }
+    resp = client.post("/predict/batch", content=msgpack.packb(payload),
+                       headers={"content-type": MSGPACK})
+    assert resp.status_code == 422
+    assert "amount must be finite and >= 0: 2 rows" in resp.json()["detail"]
+
+    df.loc[[2, 7], "amount"] = 1.0
+    payload["amount"] = df["amount"].to_numpy("<f8").tobytes()
+    resp = client.post("/predict/batch", content=msgpack.packb(payload),
+                       headers={"content-type": MSGPACK})
+    out = msgpack.unpackb(resp.content)
+    assert np.frombuffer(out["fraud_probability"], "<f8").shape == (len(df),)
+
+
+def test_predict_batch_msgpack_encoded_strings(client, fitted_pipeline):
+    import msgpack
+    import numpy as np
+    from api.columnar import MSGPACK, msgpack_payload
+    from src.data.loader import to_model_input
+
+    df   = _raw_columns()
+    resp = client.post("/predict/batch", content=msgpack_payload(df), headers={"content-type": MSGPACK})
+    assert resp.status_code == 200
+    expected = fitted_pipeline.predict_proba(to_model_input(df))[:, 1]
+    np.testing.assert_allclose(np.frombuffer(msgpack.unpackb(resp.content)["fraud_probability"], "<f8"),
+                               expected, rtol=1e-6)
+
+    payload = msgpack.unpackb(msgpack_payload(df))
+    payload["nameOrig"]["offsets"] = payload["nameOrig"]["offsets"][:-4] + np.int32(10**6).tobytes()
+    resp = client.post("/predict/batch", content=msgpack.packb(payload), headers={"content-type": MSGPACK})
+    assert resp.status_code == 422
+    assert "offsets" in resp.json()["detail"]
+
+
+# ── Test 4: payloads that decode but carry the wrong column types are 422 ────
+def test_predict_batch_arrow_wrong_string_type_is_422(client):
+    import pyarrow as pa
+    from api.columnar import ARROW_STREAM
+
+    df    = _raw_columns(3)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.set_column(table.schema.get_field_index("nameOrig"), "nameOrig",
+                             pa.array([[1], [2], [3]], pa.list_(pa.int64())))
+    sink  = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    resp = client.post("/predict/batch", content=sink.getvalue().to_pybytes(),
+                       headers={"content-type": ARROW_STREAM})
+    assert resp.status_code == 422
+    assert "Unsupported column contents" in resp.json()["detail"]
+
+
+def test_predict_batch_msgpack_non_string_categories_is_422(client):
+    import msgpack
+    from api.columnar import MSGPACK, msgpack_payload
+
+    payload = msgpack.unpackb(msgpack_payload(_raw_columns()))
+    payload["type"]["categories"] = [1, 2]
+    resp = client.post("/predict/batch", content=msgpack.packb(payload), headers={"content-type": MSGPACK})
+    assert resp.status_code == 422
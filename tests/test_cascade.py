@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from src.models.builder import build_pipeline
+from src.models.cascade import CascadeScorer, calibrate_bands, recall_loss_report
+
+
+@pytest.fixture(scope="module")
+def light_pipeline(train_df):
+    X, y = train_df
+    return build_pipeline("logreg").fit(X, y)
+
+
+# ── Test 1: out-of-scope types never reach a model ────────────────────────────
+def test_rule_stage_short_circuits_out_of_scope_types(train_df, light_pipeline, fitted_pipeline):
+    X, _ = train_df
+    X = X.iloc[:20].copy()
+    X.loc[X.index[:5], "type"] = "PAYMENT"
+
+    cascade = CascadeScorer(light_pipeline, fitted_pipeline, threshold=0.5, low=0.0)
+    proba   = cascade.predict_proba(X)[:, 1]
+
+    assert (proba[:5] == 0.0).all()
+    # low=0 sends every in-scope row to the full model
+    np.testing.assert_allclose(proba[5:], fitted_pipeline.predict_proba(X.iloc[5:])[:, 1])
+    assert cascade.counters == {"rule": 5, "light": 0, "full": 15}
+
+
+# ── Test 2: calibrated bands respect the recall-loss budget ──────────────────
+def test_calibrated_bands_bound_recall_loss(train_df, light_pipeline, fitted_pipeline):
+    X, y = train_df
+    bands = calibrate_bands(light_pipeline, fitted_pipeline, X, y, threshold=0.5, max_recall_loss=0.02)
+    assert bands["low"] <= 0.5
+
+    cascade = CascadeScorer(light_pipeline, fitted_pipeline, threshold=0.5, **bands)
+    report  = recall_loss_report(cascade, X, y)
+
+    assert report["recall_loss"] <= 0.02 + 1e-9
+    assert report["full_model_calls"] == cascade.counters["full"]
+
+
+def test_bands_must_straddle_threshold(light_pipeline, fitted_pipeline):
+    with pytest.raises(ValueError):
+        CascadeScorer(light_pipeline, fitted_pipeline, threshold=0.3, low=0.4)
+
+
+# ── Test 3: stage hits from process-mode workers reach the served model ───────
+def test_process_executor_merges_worker_counters(tmp_path, light_pipeline, fitted_pipeline):
+    import joblib
+    from api.executor import InferenceExecutor
+    from src.data.loader import synthetic_transactions
+
+    cascade    = CascadeScorer(light_pipeline, fitted_pipeline, threshold=0.5, low=0.0)
+    model_path = tmp_path / "cascade.pkl"
+    joblib.dump(cascade, model_path)
+
+    executor = InferenceExecutor(model=cascade, model_path=model_path, mode="process", workers=1).start()
+    try:
+        rows = synthetic_transactions(30, seed=2)
+        rows.loc[rows.index[:10], "type"] = "PAYMENT"
+        executor.submit(rows, deadline_s=10).result(timeout=30)
+    finally:
+        executor.shutdown()
+    assert cascade.counters == {"rule": 10, "light": 0, "full": 20}
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.models.compaction import choose_variant, pareto_front, truncate_rounds
+
+
+# ── Test 1: truncation equals scoring with an iteration range ─────────────────
+def test_truncate_rounds_matches_iteration_range(train_df, fitted_pipeline):
+    X, _ = train_df
+    compact = truncate_rounds(fitted_pipeline, 5)
+
+    Z        = fitted_pipeline[:-1].transform(X)
+    expected = fitted_pipeline.named_steps["model"].predict_proba(Z, iteration_range=(0, 5))[:, 1]
+    np.testing.assert_allclose(compact.predict_proba(X)[:, 1], expected)
+    # the teacher is left untouched
+    assert fitted_pipeline.named_steps["model"].get_booster().num_boosted_rounds() == 20
+
+
+# ── Test 2: Pareto front and budgeted choice ──────────────────────────────────
+def test_pareto_and_budget_choice():
+    table = pd.DataFrame({
+        "single_p50_ms": [2.0, 1.0, 1.5, 0.5],
+        "pr_auc":        [0.90, 0.85, 0.80, 0.60],
+        "recall":        [0.85, 0.84, 0.80, 0.50],
+    }, index=["teacher", "truncate", "dominated", "tiny"])
+
+    assert pareto_front(table).to_dict() == {
+        "teacher": True, "truncate": True, "dominated": False, "tiny": True,
+    }
+    assert choose_variant(table, budget=1.2) == "truncate"
+    with pytest.raises(ValueError):
+        choose_variant(table, budget=0.4)
+
+
+# ── Test 3: latency is measured at the serving thread count ───────────────────
+def test_measure_latency_pins_threads(train_df, fitted_pipeline):
+    import copy
+    from src.models.compaction import distill, measure_latency
+
+    X, _    = train_df
+    student = distill(fitted_pipeline, X, max_depth=2, n_estimators=5)
+    assert student.named_steps["model"].regressor_.n_jobs == -1
+
+    teacher = copy.deepcopy(fitted_pipeline)
+    for model in (teacher, student):
+        measure_latency(model, X, n_single=5, batch_size=100, n_threads=1)
+    assert teacher.named_steps["model"].n_jobs == 1
+    assert student.named_steps["model"].regressor_.n_jobs == 1
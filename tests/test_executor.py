@@ -0,0 +1,108 @@
+import threading
+import time
+import numpy as np
+import pytest
+from api.executor import DeadlineExceeded, InferenceExecutor, QueueFull
+from src.data.loader import synthetic_transactions
+
+
+class _BlockingModel:
+    """Stand-in model whose predict_proba waits until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def predict_proba(self, X):
+        self.release.wait(timeout=5)
+        return np.tile([0.9, 0.1], (len(X), 1))
+
+
+@pytest.fixture
+def blocked_executor():
+    model    = _BlockingModel()
+    executor = InferenceExecutor(model=model, workers=1, queue_size=2).start()
+    yield executor, model
+    model.release.set()
+    executor.shutdown()
+
+
+# ── Test 1: a full queue is rejected immediately ──────────────────────────────
+def test_full_queue_rejects_fast(blocked_executor):
+    executor, model = blocked_executor
+    row = synthetic_transactions(1)
+
+    running = executor.submit(row, deadline_s=5)
+    time.sleep(0.05)  # let the worker pick it up and block
+    queued = [executor.submit(row, deadline_s=5) for _ in range(2)]
+
+    t0 = time.perf_counter()
+    with pytest.raises(QueueFull):
+        executor.submit(row, deadline_s=5)
+    assert time.perf_counter() - t0 < 0.05
+
+    model.release.set()
+    for fut in [running, *queued]:
+        result = fut.result(timeout=5)
+        assert result.proba.tolist() == [0.1]
+        assert result.wait_s >= 0 and result.score_s >= 0
+    assert executor.stats()["counters"]["rejected_full"] == 1
+
+
+# ── Test 2: jobs whose deadline passes while queued are not scored ────────────
+def test_expired_jobs_are_dropped(blocked_executor):
+    executor, model = blocked_executor
+    row = synthetic_transactions(1)
+
+    executor.submit(row, deadline_s=5)
+    time.sleep(0.05)
+    late = executor.submit(row, deadline_s=0.01)
+    time.sleep(0.05)
+    model.release.set()
+
+    with pytest.raises(DeadlineExceeded):
+        late.result(timeout=5)
+    assert executor.stats()["counters"]["expired"] == 1
+
+
+class _SizedModel:
+    """Stand-in model that takes 1 ms + 50 µs per row."""
+
+    def predict_proba(self, X):
+        time.sleep(0.001 + 50e-6 * len(X))
+        return np.tile([0.9, 0.1], (len(X), 1))
+
+
+# ── Test 3: a large batch does not lock single rows out ───────────────────────
+def test_large_batch_does_not_block_single_rows():
+    executor = InferenceExecutor(model=_SizedModel(), workers=1, queue_size=4).start()
+    try:
+        row = synthetic_transactions(1)
+        executor.submit(synthetic_transactions(20_000), deadline_s=5).result(timeout=5)  # ~1 s
+
+        for _ in range(50):
+            executor.submit(row, deadline_s=0.25).result(timeout=5)
+        counters = executor.stats()["counters"]
+        assert counters["rejected_deadline"] == 0 and counters["completed"] == 51
+
+        # the per-row estimate still sheds a batch that cannot meet a short deadline
+        with pytest.raises(DeadlineExceeded):
+            executor.submit(synthetic_transactions(20_000), deadline_s=0.25)
+    finally:
+        executor.shutdown()
+
+
+# ── Test 4: a stale estimate lets a probe through after probe_s ───────────────
+def test_stale_estimate_admits_probe():
+    executor = InferenceExecutor(model=_SizedModel(), workers=1, probe_s=0.1).start()
+    try:
+        row = synthetic_transactions(1)
+        executor.submit(row, deadline_s=5).result(timeout=5)
+        executor._job_s = 10.0  # a pathological sample
+
+        with pytest.raises(DeadlineExceeded):
+            executor.submit(row, deadline_s=0.25)
+        time.sleep(0.15)
+        executor.submit(row, deadline_s=0.25).result(timeout=5)
+        assert executor.stats()["cost_model"]["job_ms"] < 10_000
+    finally:
+        executor.shutdown()
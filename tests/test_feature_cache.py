@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from src.features.cache import FeatureCache
+from src.models.builder import build_pipeline
+
+SPLIT = {"test_size": 0.15, "stratify": True, "seed": 42}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return FeatureCache(root=tmp_path / "cache", max_bytes=10 * 1024**2)
+
+
+@pytest.fixture
+def data_file(tmp_path, train_df):
+    X, y = train_df
+    path = tmp_path / "paysim.csv"
+    X.assign(isFraud=y).to_csv(path, index=False)
+    return path
+
+
+# ── Test 1: key ignores model params but not feature params or data ───────────
+def test_key_depends_on_features_not_model(cache, data_file):
+    base = cache.key(data_file, build_pipeline("xgb")[:-1], SPLIT)
+
+    assert cache.key(data_file, build_pipeline("xgb", {"max_depth": 3})[:-1], SPLIT) == base
+    assert cache.key(data_file, build_pipeline("logreg")[:-1], SPLIT) != base
+    assert cache.key(data_file, build_pipeline("xgb")[:-1], {**SPLIT, "test_size": 0.2}) != base
+
+    fe_changed = build_pipeline("xgb")[:-1]
+    fe_changed.set_params(fe__large_tx_quantile=0.99)
+    assert cache.key(data_file, fe_changed, SPLIT) != base
+
+    data_file.write_text(data_file.read_text() + "\n")
+    assert cache.key(data_file, build_pipeline("xgb")[:-1], SPLIT) != base
+
+
+# ── Test 2: round trip is memory-mapped and evicts least recently used ───────
+def test_round_trip_and_lru_eviction(cache, train_df):
+    X, y = train_df
+    features = build_pipeline("xgb")[:-1]
+    Z = features.fit_transform(X, y)
+
+    test_idx = X.index[::200]
+    cache.save("a", Z, Z[:10], y, y.loc[test_idx], features, X.loc[test_idx])
+    hit = cache.load("a")
+    assert isinstance(hit["X_train"], np.memmap)
+    assert hit["y_test"].index.equals(hit["X_test_raw"].index)
+    assert hit["y_test"].equals(y.loc[test_idx].rename("isFraud"))
+    np.testing.assert_array_equal(hit["X_train"], Z)
+    np.testing.assert_array_equal(hit["features"].transform(X), Z)
+
+    cache.max_bytes = int(cache.entries()[0]["bytes"] * 1.5)
+    cache.save("b", Z, Z[:10], y, y[:10], features, X.iloc[:10])
+    assert cache.load("a") is None
+    assert cache.load("b") is not None
+    assert cache.load("missing") is None
+
+
+# ── Test 3: editing the loading / splitting code invalidates the key ─────────
+def test_key_depends_on_data_code(cache, data_file, monkeypatch):
+    import inspect
+    from src.data import splitter
+    from src.features import cache as cache_module
+
+    base     = cache.key(data_file, build_pipeline("xgb")[:-1], SPLIT)
+    original = inspect.getsource
+    monkeypatch.setattr(cache_module.inspect, "getsource",
+                        lambda obj: original(obj) + ("# edited" if obj is splitter else ""))
+    assert cache.key(data_file, build_pipeline("xgb")[:-1], SPLIT) != base
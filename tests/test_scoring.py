@@ -0,0 +1,85 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from src.scoring.bulk import score_file
+
+
+@pytest.fixture
+def scoring_inputs(tmp_path, fitted_pipeline, train_df):
+    """Pickled synthetic pipeline and a PaySim-format CSV written to tmp_path."""
+    model_path = tmp_path / "model.pkl"
+    joblib.dump(fitted_pipeline, model_path)
+
+    X, y = train_df
+    csv_path = tmp_path / "input.csv"
+    X.assign(isFraud=y).iloc[:1050].to_csv(csv_path, index=False)
+    return model_path, csv_path
+
+
+# ── Test 1: chunked multi-process output matches in-memory scoring ────────────
+def test_score_file_preserves_order(tmp_path, scoring_inputs, fitted_pipeline):
+    model_path, csv_path = scoring_inputs
+    out = tmp_path / "scores.parquet"
+
+    summary = score_file(csv_path, out, model_path, threshold=0.5,
+                         chunk_rows=100, workers=2, keep_columns=["isFraud"])
+    result = pd.read_parquet(out)
+
+    expected = fitted_pipeline.predict_proba(pd.read_csv(csv_path))[:, 1]
+    assert summary["rows_scored"] == 1050
+    assert result["row"].tolist() == list(range(1050))
+    np.testing.assert_allclose(result["fraud_probability"], expected, rtol=1e-5)
+
+
+# ── Test 2: a rerun only scores the chunks that are missing ───────────────────
+def test_score_file_resumes_missing_chunks(tmp_path, scoring_inputs):
+    model_path, csv_path = scoring_inputs
+    out   = tmp_path / "scores.parquet"
+    parts = tmp_path / "scores.parquet.parts"
+
+    score_file(csv_path, out, model_path, threshold=0.5, chunk_rows=100, workers=2, merge=False)
+    (parts / "part-000003.parquet").unlink()
+
+    summary = score_file(csv_path, out, model_path, threshold=0.5, chunk_rows=100, workers=2)
+    assert summary["chunks_skipped"] == 10
+    assert summary["rows_scored"] == 100
+    assert len(pd.read_parquet(out)) == 1050
+    assert not parts.exists()
+
+    # parts from a different chunking are not silently mixed in
+    score_file(csv_path, out, model_path, threshold=0.5, chunk_rows=100, workers=1, merge=False)
+    with pytest.raises(ValueError):
+        score_file(csv_path, out, model_path, threshold=0.5, chunk_rows=50, workers=1)
+
+
+# ── Test 3: parts scored by a retrained model at the same path are refused ───
+def test_score_file_refuses_parts_from_other_model(tmp_path, scoring_inputs, train_df):
+    from src.models.builder import build_pipeline
+
+    model_path, csv_path = scoring_inputs
+    out = tmp_path / "scores.parquet"
+    score_file(csv_path, out, model_path, threshold=0.5, chunk_rows=100, workers=1, merge=False)
+
+    X, y = train_df
+    joblib.dump(build_pipeline("xgb", params={"n_estimators": 5, "max_depth": 2}).fit(X, y), model_path)
+    with pytest.raises(ValueError, match="different run"):
+        score_file(csv_path, out, model_path, threshold=0.5, chunk_rows=100, workers=1)
+
+
+# ── Test 4: streaming summary equals the summary of the whole file ────────────
+def test_risk_summary_matches_full_scoring():
+    from src.scoring.stream import RiskSummary
+
+    rng    = np.random.default_rng(0)
+    scored = pd.DataFrame({"row": np.arange(1000), "fraud_probability": rng.random(1000)})
+
+    summary = RiskSummary(threshold=0.9, top_k=20, bins=10)
+    for start in range(0, 1000, 128):
+        summary.update(scored.iloc[start:start + 128])
+
+    expected_top = scored.nlargest(20, "fraud_probability")["row"].tolist()
+    assert summary.top["row"].tolist() == expected_top
+    assert summary.rows == 1000
+    assert summary.flagged == int((scored["fraud_probability"] >= 0.9).sum())
+    assert summary.histogram()["rows"].sum() == 1000
@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+from src.data.loader import to_model_input
+from src.evaluation.sensitivity import axis_values, score_grid
+
+BASE = {
+    "step": 12, "type": "TRANSFER", "amount": 50000.0, "nameOrig": "C000000000",
+    "oldbalanceOrg": 50000.0, "nameDest": "C999999999", "oldbalanceDest": 0.0,
+}
+
+
+# ── Test 1: vectorised grid equals scoring each cell on its own ──────────────
+def test_score_grid_matches_cellwise_scoring(fitted_pipeline):
+    x = axis_values("amount", BASE["amount"], resolution=6)
+    y = axis_values("oldbalanceDest", BASE["oldbalanceDest"], resolution=4)
+    proba = score_grid(fitted_pipeline, BASE, "amount", x, "oldbalanceDest", y)
+
+    assert proba.shape == (4, 6)
+    assert y[0] == 0.0
+    for i, j in [(0, 0), (2, 5), (3, 1)]:
+        row = pd.DataFrame([{**BASE, "amount": x[j], "oldbalanceDest": y[i]}])
+        cell = fitted_pipeline.predict_proba(to_model_input(row))[0, 1]
+        np.testing.assert_allclose(proba[i, j], cell, rtol=1e-6)
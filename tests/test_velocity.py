@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.config import VELOCITY_FEATURES
+from src.data.loader import filter_and_clean, synthetic_transactions, to_model_input
+from src.features.velocity import VelocityFeatures, VelocityStore, windowed_past
+from src.models.builder import build_pipeline
+
+
+@pytest.fixture(scope="module")
+def velocity_pipeline(train_df):
+    X, y = train_df
+    X    = VelocityFeatures(windows=(1, 24)).compute(X)
+    return build_pipeline("xgb", params={"n_estimators": 5, "max_depth": 2}, velocity=True).fit(X, y)
+
+
+def _stream(n: int = 500, accounts: int = 20, seed: int = 3) -> pd.DataFrame:
+    """Raw rows in step order with heavily repeated accounts."""
+    rng = np.random.default_rng(seed)
+    df  = synthetic_transactions(n, seed=seed)
+    df["step"]     = np.sort(rng.integers(1, 60, size=n))
+    df["nameOrig"] = [f"C{i:09d}" for i in rng.integers(0, accounts, size=n)]
+    df["nameDest"] = [f"C{i:09d}" for i in rng.integers(0, accounts, size=n)]
+    return df
+
+
+# ── Test 1: sorted-pass window sums match a naive scan ────────────────────────
+def test_windowed_past_matches_naive_scan():
+    df = _stream()
+    keys, steps, amounts = df["nameOrig"].to_numpy(), df["step"].to_numpy(), df["amount"].to_numpy()
+
+    for w in (1, 5, 24):
+        count, total = windowed_past(keys, steps, amounts, w)
+        for i in range(len(df)):
+            past = (keys == keys[i]) & (steps >= steps[i] - w) & (steps < steps[i])
+            assert count[i] == past.sum()
+            assert np.isclose(total[i], amounts[past].sum(), rtol=1e-5)
+
+
+# ── Test 2: same-step rows (and the current row) never leak into a window ─────
+def test_same_step_rows_excluded():
+    count, total = windowed_past(
+        np.array(["A", "A", "A", "B"]), np.array([5, 5, 6, 6]), np.array([10.0, 20.0, 40.0, 80.0]), window=1
+    )
+    assert count.tolist() == [0, 0, 2, 0]
+    assert total.tolist() == [0.0, 0.0, 30.0, 0.0]
+
+
+# ── Test 3: online store reproduces the batch features on the same stream ─────
+@pytest.mark.parametrize("batch_rows", [1, 37])
+def test_store_matches_batch_transform(batch_rows):
+    df      = _stream()
+    offline = VelocityFeatures(windows=(1, 24)).compute(df)
+    store   = VelocityStore(windows=(1, 24), maxlen=len(df))
+    online  = pd.concat([store.enrich(df.iloc[i:i + batch_rows]) for i in range(0, len(df), batch_rows)],
+                        ignore_index=True)
+
+    for col in VELOCITY_FEATURES:
+        np.testing.assert_allclose(online[col], offline[col].to_numpy(), rtol=1e-5)
+
+
+# ── Test 4: velocity pipeline serves pre-filled columns, refuses missing ones ──
+def test_velocity_pipeline_uses_store_columns(velocity_pipeline):
+    rows  = VelocityStore().enrich(synthetic_transactions(8, seed=5))
+    batch = to_model_input(rows)
+    assert set(VELOCITY_FEATURES) <= set(batch.columns)
+    assert velocity_pipeline.predict_proba(batch).shape == (8, 2)
+
+    # never recomputed from the batch alone: that would drop history at its boundary
+    with pytest.raises(ValueError, match="Velocity columns missing"):
+        velocity_pipeline.predict_proba(to_model_input(synthetic_transactions(8, seed=5)))
+
+
+# ── Test 5: every transaction type counts, in training and in serving ────────
+def test_velocity_counts_all_types_before_filtering():
+    raw = to_model_input(_stream(n=200, accounts=5)).assign(isFraud=0)
+    raw.loc[raw.index[::3], "type"] = "PAYMENT"
+
+    X, _   = filter_and_clean(VelocityFeatures(windows=(1, 24)).compute(raw))
+    online = VelocityStore(windows=(1, 24), maxlen=len(raw)).enrich(raw).loc[X.index]
+    # computing after filter_and_clean would silently drop the PAYMENT history
+    after = VelocityFeatures(windows=(1, 24)).compute(filter_and_clean(raw)[0])
+    assert (X["orig_count_24h"] > after["orig_count_24h"]).any()
+    for col in VELOCITY_FEATURES:
+        np.testing.assert_allclose(online[col], X[col].to_numpy(), rtol=1e-5)
+
+
+# ── Test 6: enrichment runs inside the executor job ──────────────────────────
+def test_executor_enriches_admitted_jobs(velocity_pipeline):
+    from api.executor import InferenceExecutor
+
+    store    = VelocityStore()
+    executor = InferenceExecutor(model=velocity_pipeline, prepare=store.enrich).start()
+    try:
+        rows = _stream(n=20, accounts=3)
+        executor.submit(rows, deadline_s=5).result(timeout=5)
+    finally:
+        executor.shutdown()
+    assert sum(len(buf) for buf in store._buffers["orig"].values()) == 20
+
+
+# ── Test 7: bulk scoring is chunk-size invariant, or refuses ──────────────────
+def test_score_file_needs_precomputed_velocity(tmp_path, velocity_pipeline):
+    import joblib
+    from src.scoring.bulk import score_file
+
+    model_path = tmp_path / "velocity.pkl"
+    joblib.dump(velocity_pipeline, model_path)
+    raw = _stream(n=600, accounts=10)
+    raw.to_csv(tmp_path / "raw.csv", index=False)
+    with pytest.raises(ValueError, match="velocity pipeline"):
+        score_file(tmp_path / "raw.csv", tmp_path / "out.parquet", model_path, threshold=0.5, workers=1)
+
+    VelocityFeatures(windows=(1, 24)).compute(raw).to_csv(tmp_path / "filled.csv", index=False)
+    scores = [
+        pd.read_parquet(score_file(tmp_path / "filled.csv", tmp_path / f"out_{n}.parquet", model_path,
+                                   threshold=0.5, chunk_rows=n, workers=1)["output"])["fraud_probability"]
+        for n in (600, 50)
+    ]
+    np.testing.assert_array_equal(scores[0], scores[1])
@@ -1,11 +1,16 @@
+import argparse
 import logging
 import pickle
 import json
 from datetime import datetime
-from src.config import PAYSIM_PATH, ROOT
+import yaml
+from sklearn.pipeline import Pipeline
+from src.config import PAYSIM_PATH, ROOT, RANDOM_SEED
 from src.data.loader import load_paysim, filter_and_clean
 from src.data.splitter import split_data
+from src.features.cache import FeatureCache
 from src.models.builder import build_pipeline
+from src.models.cascade import CascadeScorer, calibrate_bands, recall_loss_report
 from sklearn.metrics import average_precision_score, precision_recall_curve
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s — %(message)s")
@@ -14,23 +19,55 @@ log = logging.getLogger(__name__)
 THRESHOLD = 0.2226  # from notebook analysis — update if retuned
 
 
-def train(model_name: str = "xgb", params: dict = None):
-    log.info("Loading data...")
-    df = load_paysim(PAYSIM_PATH)
+def train(model_name: str = "xgb", params: dict = None, use_cache: bool = None, velocity: bool = False):
+    pipeline = build_pipeline(model_name, params=params, velocity=velocity)
+    features, model = pipeline[:-1], pipeline.steps[-1][1]
 
-    log.info("Filtering and cleaning...")
-    X, y = filter_and_clean(df)
+    with open(ROOT / "params.yaml") as f:
+        cache_cfg = yaml.safe_load(f).get("feature_cache", {})
+    use_cache = cache_cfg.get("enabled", True) if use_cache is None else use_cache
+    cache     = FeatureCache(max_bytes=int(cache_cfg.get("max_gb", 5) * 1024**3)) if use_cache else None
+    split     = {"test_size": 0.15, "stratify": True, "seed": RANDOM_SEED}
+    key       = cache.key(PAYSIM_PATH, features, split) if cache else None
+    hit       = cache.load(key) if cache else None
 
-    log.info("Splitting...")
-    X_train, X_test, y_train, y_test = split_data(X, y, test_size=0.15)
-    log.info(f"Train: {X_train.shape[0]:,} | Test: {X_test.shape[0]:,}")
+    if hit:
+        log.info(f"Feature cache hit ({key}) — skipping load, split and feature fitting")
+        features = hit["features"]
+        Z_train, Z_test = hit["X_train"], hit["X_test"]
+        y_train, y_test = hit["y_train"], hit["y_test"]
+        X_test = hit["X_test_raw"]
+    else:
+        log.info("Loading data...")
+        df = load_paysim(PAYSIM_PATH)
+
+        if velocity:
+            # past-only, label-free: computed on every transaction type before filtering,
+            # as the API's VelocityStore records all scored requests; the pipeline's
+            # velocity step only checks the columns are there
+            log.info("Computing velocity features...")
+            df = features.named_steps["velocity"].compute(df)
+
+        log.info("Filtering and cleaning...")
+        X, y = filter_and_clean(df)
+
+        log.info("Splitting...")
+        X_train, X_test, y_train, y_test = split_data(X, y, test_size=split["test_size"], stratify=split["stratify"])
+
+        log.info("Engineering features...")
+        Z_train = features.fit_transform(X_train, y_train)
+        Z_test  = features.transform(X_test)
+        if cache:
+            cache.save(key, Z_train, Z_test, y_train, y_test, features, X_test)
+            log.info(f"Feature matrices cached ({key})")
+    log.info(f"Train: {Z_train.shape[0]:,} | Test: {Z_test.shape[0]:,}")
 
     log.info(f"Training {model_name}...")
-    pipeline = build_pipeline(model_name, params=params)
-    pipeline.fit(X_train, y_train)
+    model.fit(Z_train, y_train)
+    pipeline = Pipeline([*features.steps, ("model", model)])
 
     # Metrics
-    y_prob = pipeline.predict_proba(X_test)[:, 1]
+    y_prob = model.predict_proba(Z_test)[:, 1]
     pr_auc = average_precision_score(y_test, y_prob)
     y_pred = (y_prob >= THRESHOLD).astype(int)
     precision = (y_pred & y_test).sum() / y_pred.sum()
@@ -38,7 +75,8 @@ def train(model_name: str = "xgb", params: dict = None):
     f1        = 2 * precision * recall / (precision + recall)
 
     # Save model
-    out = ROOT / "models" / f"fraud_detection_v1_{model_name}.pkl"
+    suffix = "_velocity" if velocity else ""
+    out = ROOT / "models" / f"fraud_detection_v1_{model_name}{suffix}.pkl"
     out.parent.mkdir(exist_ok=True)
     with open(out, "wb") as f:
         pickle.dump(pipeline, f)
@@ -59,7 +97,8 @@ def train(model_name: str = "xgb", params: dict = None):
             }
         }
     }
-    with open(ROOT / "models" / "metadata_v1.json", "w") as f:
+    # experiment variants get their own metadata: metadata_v1.json describes the deployed model
+    with open(ROOT / "models" / f"metadata_v1{suffix}.json", "w") as f:
         json.dump(metadata, f, indent=2)
 
     log.info(f"Model saved to {out}")
@@ -67,5 +106,55 @@ def train(model_name: str = "xgb", params: dict = None):
     return pipeline, X_test, y_test
 
 
+def train_cascade(full_model: str = "xgb", max_recall_loss: float = 0.005, min_high_agreement: float = None):
+    """
+    Fit the light (logreg) stage, calibrate its bands against the saved full
+    model on half of the held-out split and report recall loss on the other half.
+    """
+    log.info("Loading data...")
+    X, y = filter_and_clean(load_paysim(PAYSIM_PATH))
+    # same split as train() — the full model has never seen X_test
+    X_train, X_test, y_train, y_test = split_data(X, y, test_size=0.15)
+    X_cal, X_eval, y_cal, y_eval     = split_data(X_test, y_test, test_size=0.5)
+
+    with open(ROOT / "models" / f"fraud_detection_v1_{full_model}.pkl", "rb") as f:
+        full = pickle.load(f)
+
+    log.info("Training light stage (logreg)...")
+    light = build_pipeline("logreg").fit(X_train, y_train)
+
+    bands = calibrate_bands(light, full, X_cal, y_cal, THRESHOLD,
+                            max_recall_loss=max_recall_loss, min_high_agreement=min_high_agreement)
+    cascade = CascadeScorer(light, full, THRESHOLD, **bands)
+    report  = recall_loss_report(cascade, X_eval, y_eval)
+    cascade.reset_counters()
+
+    out = ROOT / "models" / "fraud_detection_v1_cascade.pkl"
+    with open(out, "wb") as f:
+        pickle.dump(cascade, f)
+    with open(ROOT / "models" / "cascade_report_v1.json", "w") as f:
+        json.dump(report, f, indent=2)
+
+    log.info(f"Cascade saved to {out} | bands: {bands}")
+    log.info(f"Recall loss: {report['recall_loss']:.4f} | Stage share: {report['stage_share']}")
+    return cascade, report
+
+
 if __name__ == "__main__":
-    train(model_name="xgb")
\ No newline at end of file
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cascade", action="store_true",
+                        help="Build the tiered cascade on top of the saved xgb model instead of training it")
+    parser.add_argument("--max-recall-loss", type=float, default=0.005)
+    parser.add_argument("--min-high-agreement", type=float, default=None,
+                        help="Enable the light model's high band: flag rows above it without XGBoost, placed where "
+                             "XGBoost agrees on at least this share of them (default: disabled)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Recompute engineered features instead of using the feature cache")
+    parser.add_argument("--velocity", action="store_true",
+                        help="Add past-only velocity features (saved as fraud_detection_v1_xgb_velocity.pkl)")
+    args = parser.parse_args()
+
+    if args.cascade:
+        train_cascade(max_recall_loss=args.max_recall_loss, min_high_agreement=args.min_high_agreement)
+    else:
+        train(model_name="xgb", use_cache=not args.no_cache, velocity=args.velocity)
\ No newline at end of file